@@ -2,197 +2,290 @@
 # JUPYTER NOTEBOOK: Multi-Project Data Analysis
 # Datasets: Superstore Sales, Telco Churn, IMDb Movies,
 # Crime Data, Public Health (Heart Disease)
+#
+# Each analysis is an independent task that declares the table
+# and columns it reads and the files it writes. Tasks run on a
+# process pool, each worker holding a single DB connection, so the
+# wall-clock time is close to that of the slowest analysis.
 # ============================================================
 
 # ============================================================
 # 0. IMPORT LIBRARIES
 # ============================================================
-import mysql.connector
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
 
-plt.style.use('seaborn-darkgrid')
-print("✔ Libraries loaded successfully!\n")
+from db import get_connection, init_pool
+from cache import cached_load
+from cleaning import recode
+import plots  # forces the Agg backend: workers render to file
+
+# 'seaborn-darkgrid' was renamed in matplotlib 3.6; every worker re-applies this
+plt.style.use('seaborn-darkgrid' if 'seaborn-darkgrid' in plt.style.available
+              else 'seaborn-v0_8-darkgrid')
+
+OUTPUT_DIR = "./all_outputs"
+
+
+def save_plot(name, draw, *args, **kwargs):
+    """Render one chart into OUTPUT_DIR; each task already runs in its own worker process."""
+    return plots.render(os.path.join(OUTPUT_DIR, name), draw, *args, **kwargs)
 
-# ============================================================
-# 1. CONNECT TO MYSQL
-# ============================================================
-try:
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="admin",
-        database="testdb",
-        use_pure=True
-    )
-    print("✔ Connected to MySQL database successfully!\n")
-except Exception as e:
-    print(f"❌ ERROR: Could not connect to MySQL: {e}")
 
 # ============================================================
-# 2. Q1: SALES PERFORMANCE AND TREND ANALYSIS
+# 1. Q1: SALES PERFORMANCE AND TREND ANALYSIS
 # ============================================================
-print("===== Q1: Sales Performance =====")
+def q1_sales(df_q1):
+    report = []
+
+    # Clean data
+    df_q1.columns = df_q1.columns.str.strip()
+    df_q1['Order_Date'] = pd.to_datetime(df_q1['Order_Date'], format="%m/%d/%Y", errors='coerce')
+    df_q1['Ship_Date'] = pd.to_datetime(df_q1['Ship_Date'], format="%m/%d/%Y", errors='coerce')
+    df_q1 = df_q1.dropna(subset=['Order_Date'])
+    df_q1['Region'] = recode(df_q1['Region'], fill='Unknown')
+    df_q1['Category'] = recode(df_q1['Category'], str.title, fill='Misc')
 
-# Load data
-df_q1 = pd.read_sql("SELECT * FROM q1_data", conn)
+    # Top products
+    top_products = df_q1.groupby('Product_Name').size().reset_index(name='transactions')\
+                        .sort_values('transactions', ascending=False).head(10)
+    report.append(("Top Products", top_products))
 
-# Clean data
-df_q1.columns = df_q1.columns.str.strip()
-df_q1['Order_Date'] = pd.to_datetime(df_q1['Order_Date'], format="%m/%d/%Y", errors='coerce')
-df_q1['Ship_Date'] = pd.to_datetime(df_q1['Ship_Date'], format="%m/%d/%Y", errors='coerce')
-df_q1 = df_q1.dropna(subset=['Order_Date'])
-df_q1['Region'] = df_q1['Region'].fillna('Unknown')
-df_q1['Category'] = df_q1['Category'].str.title().fillna('Misc')
+    # Top regions
+    top_regions = df_q1.groupby('Region').size().reset_index(name='transactions')\
+                       .sort_values('transactions', ascending=False)
+    report.append(("Top Regions", top_regions))
 
-# Top products
-top_products = df_q1.groupby('Product_Name').size().reset_index(name='transactions')\
-                    .sort_values('transactions', ascending=False).head(10)
-print("\nTop Products:")
-print(top_products)
+    # Monthly trends
+    df_q1['Month'] = df_q1['Order_Date'].dt.to_period('M')
+    monthly_trends = df_q1.groupby('Month').size().reset_index(name='transactions')
+    report.append(("Monthly Trends", monthly_trends.head()))
 
-# Top regions
-top_regions = df_q1.groupby('Region').size().reset_index(name='transactions')\
-                   .sort_values('transactions', ascending=False)
-print("\nTop Regions:")
-print(top_regions)
+    # Plot trend
+    save_plot("q1_monthly_trend.png", plots.line, monthly_trends['Month'].astype(str),
+              monthly_trends['transactions'], title="Monthly Sales Trend", xlabel="Month",
+              ylabel="Number of Transactions", marker='o', rotation=45, figsize=(10,5))
 
-# Monthly trends
-df_q1['Month'] = df_q1['Order_Date'].dt.to_period('M')
-monthly_trends = df_q1.groupby('Month').size().reset_index(name='transactions')
-print("\nMonthly Trends:")
-print(monthly_trends.head())
+    return report
 
-# Plot trend
-plt.figure(figsize=(10,5))
-plt.plot(monthly_trends['Month'].astype(str), monthly_trends['transactions'], marker='o')
-plt.xticks(rotation=45)
-plt.title("Monthly Sales Trend")
-plt.xlabel("Month")
-plt.ylabel("Number of Transactions")
-plt.show()
 
 # ============================================================
-# 3. Q2: CUSTOMER CHURN PREDICTION ANALYSIS
+# 2. Q2: CUSTOMER CHURN PREDICTION ANALYSIS
 # ============================================================
-print("===== Q2: Customer Churn Analysis =====")
-
-# Load data
-df_q2 = pd.read_sql("SELECT * FROM q2_data", conn)
-
-# Clean data
-df_q2.columns = df_q2.columns.str.strip()
 num_cols = ['SeniorCitizen', 'tenure', 'MonthlyCharges']
-df_q2[num_cols] = df_q2[num_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
 cat_cols = ['gender','Partner','Dependents','PhoneService','MultipleLines',
             'InternetService','OnlineSecurity','OnlineBackup','DeviceProtection',
             'TechSupport','StreamingTV','StreamingMovies','Contract','PaperlessBilling',
             'PaymentMethod','Churn']
-df_q2[cat_cols] = df_q2[cat_cols].fillna('Unknown').astype(str)
 
-# Churn counts
-churn_counts = df_q2['Churn'].value_counts()
-print("\nChurn Distribution:")
-print(churn_counts)
 
-# Plot churn
-plt.figure(figsize=(6,4))
-sns.countplot(x='Churn', data=df_q2)
-plt.title("Customer Churn Distribution")
-plt.show()
+def q2_churn(df_q2):
+    report = []
 
-# Correlation
-numeric_corr = df_q2[num_cols + ['Churn']].copy()
-numeric_corr['Churn'] = numeric_corr['Churn'].map({'Yes':1, 'No':0})
-print("\nCorrelation with Churn:")
-print(numeric_corr.corr()['Churn'].sort_values(ascending=False))
+    # Clean data
+    df_q2.columns = df_q2.columns.str.strip()
+    df_q2[num_cols] = df_q2[num_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+    for col in cat_cols:
+        df_q2[col] = recode(df_q2[col], str, fill='Unknown')
 
-# ============================================================
-# 4. Q3: MOVIE RATINGS & GENRE ANALYSIS
-# ============================================================
-print("===== Q3: Movie Ratings Analysis =====")
+    # Churn counts
+    churn_counts = df_q2['Churn'].value_counts()
+    report.append(("Churn Distribution", churn_counts))
 
-# Load data
-df_q3 = pd.read_sql("SELECT * FROM q3_data", conn)
-df_q3.columns = df_q3.columns.str.strip()
+    # Plot churn
+    counts = churn_counts.sort_index()
+    save_plot("q2_churn_distribution.png", plots.bar, counts.index, counts.to_numpy(),
+              title="Customer Churn Distribution", xlabel="Churn", ylabel="count", figsize=(6,4))
 
-# Convert numeric columns
-num_cols_q3 = ['Rating', 'DirectorsRating', 'WritersRating', 'TotalFollowers', 'Revenue']
-for col in num_cols_q3:
-    df_q3[col] = pd.to_numeric(df_q3[col], errors='coerce')
+    # Correlation
+    numeric_corr = df_q2[num_cols + ['Churn']].copy()
+    numeric_corr['Churn'] = numeric_corr['Churn'].map({'Yes':1, 'No':0})
+    report.append(("Correlation with Churn", numeric_corr.corr()['Churn'].sort_values(ascending=False)))
 
-# Top-rated movies
-top_movies = df_q3[['Movie_Name','Rating']].sort_values('Rating', ascending=False).head(10)
-print("\nTop Rated Movies:")
-print(top_movies)
+    return report
 
-# Plot critics vs audience
-plt.figure(figsize=(7,5))
-plt.scatter(df_q3['DirectorsRating'], df_q3['Rating'], alpha=0.6)
-plt.xlabel("Director's Rating")
-plt.ylabel("Audience Rating")
-plt.title("Director vs Audience Rating")
-plt.show()
 
 # ============================================================
-# 5. Q4: PUBLIC HEALTH / HEART DISEASE ANALYSIS
+# 3. Q3: MOVIE RATINGS & GENRE ANALYSIS
 # ============================================================
-print("===== Q4: Heart Disease Analysis =====")
+num_cols_q3 = ['Rating', 'DirectorsRating', 'WritersRating', 'TotalFollowers', 'Revenue']
+
+
+def q3_movies(df_q3):
+    report = []
+    df_q3.columns = df_q3.columns.str.strip()
 
-df_q4 = pd.read_sql("SELECT * FROM q4_data", conn)
-df_q4.columns = df_q4.columns.str.strip()
+    # Convert numeric columns
+    for col in num_cols_q3:
+        df_q3[col] = pd.to_numeric(df_q3[col], errors='coerce')
 
+    # Top-rated movies
+    top_movies = df_q3[['Movie_Name','Rating']].sort_values('Rating', ascending=False).head(10)
+    report.append(("Top Rated Movies", top_movies))
+
+    # Plot critics vs audience
+    save_plot("q3_director_vs_audience.png", *plots.points(df_q3['DirectorsRating'], df_q3['Rating']),
+              title="Director vs Audience Rating",
+              xlabel="Director's Rating", ylabel="Audience Rating", alpha=0.6, figsize=(7,5))
+
+    return report
+
+
+# ============================================================
+# 4. Q4: PUBLIC HEALTH / HEART DISEASE ANALYSIS
+# ============================================================
 num_cols_q4 = ['age','trestbps','chol','thalch','oldpeak','num']
 cat_cols_q4 = ['sex','cp','fbs','restecg','exang','slope','ca','thal']
-df_q4[num_cols_q4] = df_q4[num_cols_q4].apply(pd.to_numeric, errors='coerce').fillna(0)
-df_q4[cat_cols_q4] = df_q4[cat_cols_q4].fillna('Unknown').astype(str)
-
-# Summary stats
-print("\nSummary Statistics:")
-print(df_q4.describe())
-
-# Correlation heatmap
-plt.figure(figsize=(10,8))
-sns.heatmap(df_q4[num_cols_q4].corr(), annot=True, cmap='coolwarm')
-plt.title("Correlation Heatmap")
-plt.show()
-
-# Age vs Heart Disease
-plt.figure(figsize=(7,5))
-plt.scatter(df_q4['age'], df_q4['num'])
-plt.xlabel("Age")
-plt.ylabel("Heart Disease Score")
-plt.title("Age vs Heart Disease Severity")
-plt.show()
-
-# ============================================================
-# 6. Q5: CRIME DATA ANALYSIS
-# ============================================================
-print("===== Q5: Crime Data Analysis =====")
-
-df_q5 = pd.read_sql("SELECT * FROM q5_data", conn)
-df_q5.columns = df_q5.columns.str.strip()
-
-# Convert dates
-df_q5['DATE_OCC'] = pd.to_datetime(df_q5['DATE_OCC'], errors='coerce')
-df_q5 = df_q5.dropna(subset=['DATE_OCC'])
-
-# Crimes by AREA_NAME
-area_counts = df_q5.groupby('AREA_NAME').size().reset_index(name='crime_count')\
-                    .sort_values('crime_count', ascending=False)
-print("\nTop Crime Areas:")
-print(area_counts.head(10))
-
-# Daily trend
-df_q5['Date'] = df_q5['DATE_OCC'].dt.date
-daily_trends = df_q5.groupby('Date').size().reset_index(name='crime_count')
-
-plt.figure(figsize=(12,5))
-plt.plot(daily_trends['Date'], daily_trends['crime_count'])
-plt.title("Daily Crime Trend")
-plt.xlabel("Date")
-plt.ylabel("Number of Crimes")
-plt.xticks(rotation=45)
-plt.show()
+
+
+def q4_heart(df_q4):
+    report = []
+    df_q4.columns = df_q4.columns.str.strip()
+
+    df_q4[num_cols_q4] = df_q4[num_cols_q4].apply(pd.to_numeric, errors='coerce').fillna(0)
+    for col in cat_cols_q4:
+        df_q4[col] = recode(df_q4[col], str, fill='Unknown')
+
+    # Summary stats
+    report.append(("Summary Statistics", df_q4.describe()))
+
+    # Correlation heatmap
+    save_plot("q4_correlation_heatmap.png", plots.heatmap, df_q4[num_cols_q4].corr(),
+              title="Correlation Heatmap", figsize=(10,8))
+
+    # Age vs Heart Disease
+    save_plot("q4_age_vs_disease.png", *plots.points(df_q4['age'], df_q4['num']),
+              title="Age vs Heart Disease Severity", xlabel="Age", ylabel="Heart Disease Score",
+              figsize=(7,5))
+
+    return report
+
+
+# ============================================================
+# 5. Q5: CRIME DATA ANALYSIS
+# ============================================================
+def q5_crime(df_q5):
+    report = []
+    df_q5.columns = df_q5.columns.str.strip()
+
+    # Convert dates
+    df_q5['DATE_OCC'] = pd.to_datetime(df_q5['DATE_OCC'], errors='coerce')
+    df_q5 = df_q5.dropna(subset=['DATE_OCC'])
+
+    # Crimes by AREA_NAME
+    area_counts = df_q5.groupby('AREA_NAME').size().reset_index(name='crime_count')\
+                        .sort_values('crime_count', ascending=False)
+    report.append(("Top Crime Areas", area_counts.head(10)))
+
+    # Daily trend
+    df_q5['Date'] = df_q5['DATE_OCC'].dt.date
+    daily_trends = df_q5.groupby('Date').size().reset_index(name='crime_count')
+
+    # One vertex per day would outgrow the plot width: keep PLOT_MAX_POINTS of them
+    dates, counts = plots.downsample(daily_trends['Date'], daily_trends['crime_count'])
+    save_plot("q5_daily_trend.png", plots.line, dates, counts,
+              title="Daily Crime Trend", xlabel="Date", ylabel="Number of Crimes", rotation=45,
+              figsize=(12,5))
+
+    return report
+
+
+# ============================================================
+# 6. TASK REGISTRY + RUNNER
+# ============================================================
+TASKS = [
+    {
+        "name": "Q1: Sales Performance",
+        "func": q1_sales,
+        "table": "q1_data",
+        "columns": ["Order_Date", "Ship_Date", "Region", "Category", "Product_Name"],
+        "dtypes": None,
+        "outputs": ["q1_monthly_trend.png"],
+    },
+    {
+        "name": "Q2: Customer Churn Analysis",
+        "func": q2_churn,
+        "table": "q2_data",
+        "columns": num_cols + cat_cols,
+        "dtypes": {col: "float64" for col in num_cols},
+        "outputs": ["q2_churn_distribution.png"],
+    },
+    {
+        "name": "Q3: Movie Ratings Analysis",
+        "func": q3_movies,
+        "table": "q3_data",
+        "columns": ['Movie_Name'] + num_cols_q3,
+        "dtypes": None,
+        "outputs": ["q3_director_vs_audience.png"],
+    },
+    {
+        "name": "Q4: Heart Disease Analysis",
+        "func": q4_heart,
+        "table": "q4_data",
+        "columns": num_cols_q4 + cat_cols_q4,
+        "dtypes": None,
+        "outputs": ["q4_correlation_heatmap.png", "q4_age_vs_disease.png"],
+    },
+    {
+        "name": "Q5: Crime Data Analysis",
+        "func": q5_crime,
+        "table": "q5_data",
+        "columns": ['DATE_OCC', 'AREA_NAME'],
+        "dtypes": None,
+        "outputs": ["q5_daily_trend.png"],
+    },
+]
+
+
+def run_task(task):
+    """Worker entry point: borrow a pooled connection, load the declared input, run the analysis."""
+    start = time.perf_counter()
+    conn = get_connection()
+    try:
+        df = cached_load(conn, task["table"], task["columns"], task["dtypes"])
+    finally:
+        conn.close()
+    report = task["func"](df)
+    return report, time.perf_counter() - start
+
+
+def print_report(task, report, elapsed):
+    print(f"===== {task['name']} ({elapsed:.1f}s) =====")
+    for title, result in report:
+        print(f"\n{title}:")
+        print(result)
+    for name in task["outputs"]:
+        print(f"✔ Saved {os.path.join(OUTPUT_DIR, name)}")
+    print()
+
+
+def main(max_workers=None):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    start = time.perf_counter()
+    failed = 0
+
+    # One connection per worker: each runs one task at a time
+    with ProcessPoolExecutor(max_workers=max_workers or len(TASKS),
+                             initializer=init_pool, initargs=(1,)) as pool:
+        futures = {pool.submit(run_task, task): task for task in TASKS}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                report, elapsed = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ ERROR in {task['name']}: {e}\n")
+                continue
+            print_report(task, report, elapsed)
+
+    print(f"✔ {len(TASKS) - failed}/{len(TASKS)} analyses finished in {time.perf_counter() - start:.1f}s")
+    return failed
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if main() else 0)
@@ -1,126 +1,191 @@
-import mysql.connector
-import pandas as pd
-import matplotlib.pyplot as plt
-
-# ----------------------------
-# 1. Connect to MySQL
-# ----------------------------
-try:
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="admin",
-        database="testdb",
-        use_pure=True,
-        connection_timeout=10,
-        autocommit=True
-    )
-    print("✓ Database connected successfully")
-except Exception as e:
-    print(f"✗ Database connection failed: {e}")
-    exit(1)
-
-try:
-    df = pd.read_sql("SELECT * FROM q1_data", conn)
-    print(f"✓ Data loaded: {len(df)} rows")
-except Exception as e:
-    print(f"✗ Data loading failed: {e}")
-    exit(1)
-
-# ----------------------------
-# 2. Data Cleaning
-# ----------------------------
-df.columns = df.columns.str.strip().str.replace(" ", "_")
-
-df['Order_Date'] = pd.to_datetime(df['Order_Date'], format="%m/%d/%Y", errors='coerce')
-df['Ship_Date']  = pd.to_datetime(df['Ship_Date'],  format="%m/%d/%Y", errors='coerce')
-
-# Remove rows where date failed conversion
-df = df.dropna(subset=['Order_Date'])
-
-df['Postal_Code'] = df['Postal_Code'].fillna(0)
-df['Region']      = df['Region'].fillna("Unknown")
-df['Category']    = df['Category'].str.title().fillna("Misc")
+import os
 
-# ----------------------------
-# 3. Top Products
-# ----------------------------
-top_products = (
-    df.groupby('Product_Name')
-      .size()
-      .reset_index(name='transactions')
-      .sort_values('transactions', ascending=False)
-      .head(10)
-)
+import pandas as pd
 
-print("\nTop Products:")
-print(top_products)
+from db import get_connection
+from cache import cached_load
+from cleaning import recode
+from engines import sales_summary
+from footprint import report
+from loader import read_query
+import plots
+
+# Only the columns this analysis touches are pulled from q1_data
+COLUMNS = ["Order_Date", "Ship_Date", "Postal_Code", "Region", "Category", "Product_Name"]
+DTYPES = {"Postal_Code": "float64"}
+
+# Q1_ENGINE=sql runs the aggregations as GROUP BY queries on the server so
+# only their result sets cross the wire. Otherwise q1_data is loaded and
+# grouped locally on "pandas" (default), "duckdb" or "polars" (see engines.py).
+ENGINE = os.environ.get("Q1_ENGINE", "pandas").lower()
+
+# Same row filter and Region default as the pandas cleaning below
+VALID_ORDER = "STR_TO_DATE(`Order_Date`, '%m/%d/%Y') IS NOT NULL"
+REGION = "COALESCE(`Region`, 'Unknown')"
+
+SQL = {
+    "top_products": f"""
+        SELECT `Product_Name`, COUNT(*) AS transactions
+        FROM q1_data
+        WHERE {VALID_ORDER} AND `Product_Name` IS NOT NULL
+        GROUP BY `Product_Name`
+        ORDER BY transactions DESC, `Product_Name`
+        LIMIT 10""",
+    "top_regions": f"""
+        SELECT {REGION} AS Region, COUNT(*) AS transactions
+        FROM q1_data
+        WHERE {VALID_ORDER}
+        GROUP BY {REGION}
+        ORDER BY transactions DESC""",
+    "monthly_trends": f"""
+        SELECT DATE_FORMAT(STR_TO_DATE(`Order_Date`, '%m/%d/%Y'), '%Y-%m') AS Month,
+               COUNT(*) AS transactions
+        FROM q1_data
+        WHERE {VALID_ORDER}
+        GROUP BY Month
+        ORDER BY Month""",
+    "regional_strength": f"""
+        SELECT `Product_Name`, {REGION} AS Region, COUNT(*) AS transactions
+        FROM q1_data
+        WHERE {VALID_ORDER} AND `Product_Name` IS NOT NULL
+        GROUP BY `Product_Name`, {REGION}
+        ORDER BY `Product_Name`, Region""",
+}
 
 # ----------------------------
-# 4. Top Regions
+# Cleaning + aggregation (also timed by benchmarks/bench_pipeline.py)
 # ----------------------------
-top_regions = (
-    df.groupby('Region')
-      .size()
-      .reset_index(name='transactions')
-      .sort_values('transactions', ascending=False)
-)
+def clean(df):
+    """Parsed dates, undated orders dropped, Postal_Code / Region / Category defaults."""
+    df.columns = df.columns.str.strip().str.replace(" ", "_")
+
+    df['Order_Date'] = pd.to_datetime(df['Order_Date'], format="%m/%d/%Y", errors='coerce')
+    df['Ship_Date']  = pd.to_datetime(df['Ship_Date'],  format="%m/%d/%Y", errors='coerce')
+
+    # Remove rows where date failed conversion
+    df = df.dropna(subset=['Order_Date'])
+
+    df['Postal_Code'] = df['Postal_Code'].fillna(0)
+    # Region and Category are categoricals (schema.py): fill/title-case per category
+    df['Region']      = recode(df['Region'], fill="Unknown")
+    df['Category']    = recode(df['Category'], str.title, fill="Misc")
+    return df
+
+
+def aggregate(df, engine=ENGINE):
+    """Top products / regions, monthly trend and per-region counts (engines.sales_summary)."""
+    return sales_summary(df, engine)
+
+
+def main():
+    # ----------------------------
+    # 1. Connect to MySQL
+    # ----------------------------
+    try:
+        conn = get_connection()
+        print("✓ Database connected successfully")
+    except Exception as e:
+        print(f"✗ Database connection failed: {e}")
+        exit(1)
+
+    def run_sql(name):
+        try:
+            return read_query(conn, SQL[name])
+        except Exception as e:
+            print(f"✗ Query '{name}' failed: {e}")
+            exit(1)
+
+    if ENGINE == "sql":
+        print("✓ Aggregating on the MySQL server (Q1_ENGINE=sql)")
+    else:
+        try:
+            df = cached_load(conn, "q1_data", COLUMNS, DTYPES)
+            print(f"✓ Data loaded: {len(df)} rows")
+        except Exception as e:
+            print(f"✗ Data loading failed: {e}")
+            exit(1)
+
+        # ----------------------------
+        # 2. Data Cleaning
+        # ----------------------------
+        df = clean(df)
+        report("q1_data after cleaning", df)
+
+        summary = aggregate(df)
+        print(f"✓ Aggregated with the {ENGINE} engine")
+
+    # ----------------------------
+    # 3. Top Products
+    # ----------------------------
+    if ENGINE == "sql":
+        top_products = run_sql("top_products")
+    else:
+        top_products = summary["top_products"]
+
+    print("\nTop Products:")
+    print(top_products)
+
+    # ----------------------------
+    # 4. Top Regions
+    # ----------------------------
+    if ENGINE == "sql":
+        top_regions = run_sql("top_regions")
+    else:
+        top_regions = summary["top_regions"]
+
+    print("\nTop Regions:")
+    print(top_regions)
+
+    # ----------------------------
+    # 5. Monthly Trends
+    # ----------------------------
+    if ENGINE == "sql":
+        monthly_trends = run_sql("monthly_trends")
+        monthly_trends['Month'] = pd.PeriodIndex(monthly_trends['Month'], freq='M')
+    else:
+        monthly_trends = summary["monthly_trends"]
+
+    print("\nMonthly Trend:")
+    print(monthly_trends)
+
+    # ----------------------------
+    # 6. Plot Trends
+    # ----------------------------
+    charts = plots.Renderer()
+    charts.submit("trend_plot.png", plots.line, monthly_trends['Month'].astype(str),
+                  monthly_trends['transactions'], title="Monthly Sales Trend", xlabel="Month",
+                  ylabel="Number of Transactions", rotation=45, figsize=(10,5))
+
+    # ----------------------------
+    # 7. To be Promoted
+    # ----------------------------
+    if ENGINE == "sql":
+        regional_strength = run_sql("regional_strength")
+    else:
+        regional_strength = summary["regional_strength"]
+
+    strong_products = (
+        regional_strength.groupby('Product_Name')['transactions']
+        .sum()
+        .sort_values(ascending=False)
+        .head(10)
+    )
 
-print("\nTop Regions:")
-print(top_regions)
+    strong_products
+    print("\nProducts to be Promoted:")
+    print(strong_products)
 
-# ----------------------------
-# 5. Monthly Trends
-# ----------------------------
-df['Month'] = df['Order_Date'].dt.to_period('M')
+    # Sales high/low
+    monthly_trends.sort_values('transactions', ascending=False).head()
+    monthly_trends.sort_values('transactions').head()
+    print("\nMonths with Highest Sales:")
+    print(monthly_trends.sort_values('transactions', ascending=False).head())
+    print("\nMonths with Lowest Sales:")
+    print(monthly_trends.sort_values('transactions').head())
 
-monthly_trends = (
-    df.groupby('Month')
-      .size()
-      .reset_index(name='transactions')
-)
+    # Wait for the chart workers before exiting
+    charts.wait()
 
-print("\nMonthly Trend:")
-print(monthly_trends)
 
-# ----------------------------
-# 6. Plot Trends
-# ----------------------------
-plt.figure(figsize=(10,5))
-plt.plot(monthly_trends['Month'].astype(str), monthly_trends['transactions'])
-plt.xticks(rotation=45)
-plt.title("Monthly Sales Trend")
-plt.xlabel("Month")
-plt.ylabel("Number of Transactions")
-plt.tight_layout()
-plt.savefig("trend_plot.png")
-print("\n✓ Plot saved as 'trend_plot.png'")
-plt.show()
-
-# ----------------------------
-# 7. To be Promoted
-# ----------------------------
-regional_strength = (
-    df.groupby(['Product_Name', 'Region'])
-      .size()
-      .reset_index(name='transactions')
-)
-
-strong_products = (
-    regional_strength.groupby('Product_Name')['transactions']
-    .sum()
-    .sort_values(ascending=False)
-    .head(10)
-)
-
-strong_products
-print("\nProducts to be Promoted:")
-print(strong_products)
-
-# Sales high/low
-monthly_trends.sort_values('transactions', ascending=False).head()
-monthly_trends.sort_values('transactions').head()
-print("\nMonths with Highest Sales:")
-print(monthly_trends.sort_values('transactions', ascending=False).head())
-print("\nMonths with Lowest Sales:")
-print(monthly_trends.sort_values('transactions').head())
\ No newline at end of file
+if __name__ == "__main__":
+    main()
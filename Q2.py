@@ -3,148 +3,148 @@
 # LOAD DATA FROM MYSQL → CLEAN → TRAIN MODEL → ANALYZE
 # ================================================
 
-import mysql.connector
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
-# -------------------------------------------------------
-# 1. CONNECT TO MYSQL
-# -------------------------------------------------------
-try:
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="admin",
-        database="testdb",
-        use_pure=True,
-        connection_timeout=10,
-        autocommit=True
-    )
-    print("✓ Database connected successfully")
-except Exception as e:
-    print(f"✗ Database connection failed: {e}")
-    exit(1)
-
-# -------------------------------------------------------
-# 2. LOAD DATA FROM MYSQL TABLE
-# -------------------------------------------------------
-try:
-    df = pd.read_sql("SELECT * FROM q2_data", conn)
-    print(f"✓ Data loaded successfully: {len(df)} rows")
-except Exception as e:
-    print(f"✗ Data loading failed: {e}")
-    exit(1)
-
-# -------------------------------------------------------
-# 3. CLEANING COLUMN NAMES
-# -------------------------------------------------------
-df.columns = df.columns.str.strip().str.replace(" ", "_")
-print("\nCleaned Columns:", df.columns.tolist())
-
-# -------------------------------------------------------
-# 4. DATA CLEANING
-# -------------------------------------------------------
-
-# Remove ID fields
-if "id" in df.columns:
-    df.drop(columns=["id"], inplace=True, errors="ignore")
-if "customerID" in df.columns:
-    df.drop(columns=["customerID"], inplace=True, errors="ignore")
-
-# Convert TotalCharges from VARCHAR → numeric
-df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
-
-# Fill missing TotalCharges with median
-df["TotalCharges"].fillna(df["TotalCharges"].median(), inplace=True)
-
-# Tenure: fill missing with 0
-df["tenure"].fillna(0, inplace=True)
-
-# -------------------------------------------------------
-# 5. FEATURE ENGINEERING
-# -------------------------------------------------------
-
-# Avg monthly spend
-df["AvgMonthlySpend"] = df["TotalCharges"] / df["tenure"].replace(0, 1)
-
-# Tenure groups
-df["TenureGroup"] = pd.cut(
-    df["tenure"],
-    bins=[0, 12, 24, 48, 72],
-    labels=["0-1 Year", "1-2 Years", "2-4 Years", "4-6 Years"]
-)
-
-# -------------------------------------------------------
-# 6. ENCODING CATEGORICAL VARIABLES
-# -------------------------------------------------------
-
-label = LabelEncoder()
-
-for col in df.select_dtypes(include="object").columns:
-    df[col] = label.fit_transform(df[col].astype(str))
-
-# Encode TenureGroup after it's created
-if "TenureGroup" in df.columns:
-    df["TenureGroup"] = label.fit_transform(df["TenureGroup"].astype(str))
-
-print("\n✓ Encoding completed")
-
-# -------------------------------------------------------
-# 7. SPLIT DATA INTO TRAIN/TEST
-# -------------------------------------------------------
-X = df.drop("Churn", axis=1)
-y = df["Churn"]
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-print("\n✓ Train/Test ready")
-
-# -------------------------------------------------------
-# 8. TRAIN MODEL (Random Forest)
-# -------------------------------------------------------
-model = RandomForestClassifier(n_estimators=250, random_state=42)
-model.fit(X_train, y_train)
-
-print("\n✓ Model training complete")
-
-# -------------------------------------------------------
-# 9. PREDICTIONS & EVALUATION
-# -------------------------------------------------------
-pred = model.predict(X_test)
-
-print("\nModel Accuracy:", accuracy_score(y_test, pred))
-print("\nClassification Report:\n", classification_report(y_test, pred))
-
-cm = confusion_matrix(y_test, pred)
-print("\nConfusion Matrix:\n", cm)
-
-# -------------------------------------------------------
-# 10. FEATURE IMPORTANCE (Top Factors Causing Churn)
-# -------------------------------------------------------
-importance = pd.Series(model.feature_importances_, index=X.columns)
-importance = importance.sort_values(ascending=False)
-
-print("\nTop 10 Churn Indicators:")
-print(importance.head(10))
-
-# -------------------------------------------------------
-# 11. VISUALIZE FEATURE IMPORTANCE
-# -------------------------------------------------------
-plt.figure(figsize=(10,6))
-importance.head(10).plot(kind='bar')
-plt.title("Top 10 Churn Indicators")
-plt.xlabel("Feature")
-plt.ylabel("Importance Score")
-plt.tight_layout()
-plt.savefig("churn_feature_importance.png")
-plt.show()
-print("\n✓ Feature importance chart saved as 'churn_feature_importance.png'")
-
+from db import get_connection
+from cache import cached_load
+from churn import (COLUMNS, DTYPES, FEATURES, IMPORTANCE, MODEL, N_JOBS, TARGET, build_pipeline,
+                   default_model, feature_importance, permutation_importances, save, target,
+                   training_threads)
+from footprint import report
+import plots
+
+
+# -------------------------------------------------------
+# Cleaning, split and training (also timed by benchmarks/bench_pipeline.py)
+# -------------------------------------------------------
+def clean(df):
+    """Underscored column names, id fields dropped, unlabelled rows dropped."""
+    df.columns = df.columns.str.strip().str.replace(" ", "_")
+
+    # Remove ID fields
+    if "id" in df.columns:
+        df.drop(columns=["id"], inplace=True, errors="ignore")
+    if "customerID" in df.columns:
+        df.drop(columns=["customerID"], inplace=True, errors="ignore")
+
+    # Rows without a Churn label cannot be used for training
+    return df[df[TARGET].notna()]
+
+
+def split(df):
+    """X_train, X_test, y_train, y_test: the model features and 0/1 target, 80/20."""
+    return train_test_split(df[FEATURES], target(df), test_size=0.2, random_state=42)
+
+
+def train(X_train, y_train, backend=MODEL):
+    """Fit the churn pipeline (churn.py) for `backend`; ValueError for an unknown one."""
+    model = build_pipeline(default_model(backend))
+    with training_threads():
+        model.fit(X_train, y_train)
+    return model
+
+
+def main():
+    # -------------------------------------------------------
+    # 1. CONNECT TO MYSQL
+    # -------------------------------------------------------
+    try:
+        conn = get_connection()
+        print("✓ Database connected successfully")
+    except Exception as e:
+        print(f"✗ Database connection failed: {e}")
+        exit(1)
+
+    # -------------------------------------------------------
+    # 2. LOAD DATA FROM MYSQL TABLE
+    # -------------------------------------------------------
+    try:
+        df = cached_load(conn, "q2_data", COLUMNS, DTYPES)
+        print(f"✓ Data loaded successfully: {len(df)} rows")
+    except Exception as e:
+        print(f"✗ Data loading failed: {e}")
+        exit(1)
+
+    # -------------------------------------------------------
+    # 3. CLEANING COLUMN NAMES + 4. DATA CLEANING
+    # -------------------------------------------------------
+    df = clean(df)
+    print("\nCleaned Columns:", df.columns.tolist())
+
+    # -------------------------------------------------------
+    # 5. FEATURE ENGINEERING + 6. ENCODING
+    #    Both are pipeline stages (churn.py): TotalCharges / tenure filling,
+    #    AvgMonthlySpend and TenureGroup, then one OrdinalEncoder pass over
+    #    every categorical column. They are fitted on the training split and
+    #    saved with the model.
+    # -------------------------------------------------------
+    report("q2_data after cleaning", df)
+
+    # -------------------------------------------------------
+    # 7. SPLIT DATA INTO TRAIN/TEST
+    # -------------------------------------------------------
+    X_train, X_test, y_train, y_test = split(df)
+
+    print("\n✓ Train/Test ready")
+
+    # -------------------------------------------------------
+    # 8. TRAIN MODEL (Q2_MODEL: "rf" random forest, "hgb" gradient boosting)
+    # -------------------------------------------------------
+    try:
+        model = train(X_train, y_train)
+    except ValueError as e:
+        print(f"✗ {e}")
+        exit(1)
+
+    print(f"\n✓ Model training complete ({MODEL}, n_jobs={N_JOBS}; set Q2_MODEL / Q2_N_JOBS to change)")
+    if MODEL == "hgb":
+        print(f"✓ Early stopping kept {model.named_steps['model'].n_iter_} boosting rounds")
+
+    # -------------------------------------------------------
+    # 9. PREDICTIONS & EVALUATION
+    # -------------------------------------------------------
+    pred = model.predict(X_test)
+
+    accuracy = accuracy_score(y_test, pred)
+    print("\nModel Accuracy:", accuracy)
+    print("\nClassification Report:\n", classification_report(y_test, pred))
+
+    cm = confusion_matrix(y_test, pred)
+    print("\nConfusion Matrix:\n", cm)
+
+    # Persist model + fitted encoders for score.py
+    path = save(model, backend=MODEL, rows=len(X_train), accuracy=round(accuracy, 4))
+    print(f"\n✓ Model saved -> {path}")
+
+    # -------------------------------------------------------
+    # 10. FEATURE IMPORTANCE (Top Factors Causing Churn)
+    # -------------------------------------------------------
+    # Permutation importance (Q2_IMPORTANCE=permutation, and always for gradient
+    # boosting, which has no impurity importances) is measured on the test split
+    if IMPORTANCE == "permutation" or MODEL == "hgb":
+        print(f"\nPermutation importance over {len(X_test)} test rows ...")
+        permuted = permutation_importances(model, X_test, y_test)
+        importance = permuted["importance"].sort_values(ascending=False)
+        errors = permuted["ci95"].reindex(importance.index)
+    else:
+        importance = feature_importance(model).sort_values(ascending=False)
+        errors = None
+
+    print("\nTop 10 Churn Indicators:")
+    print(importance.head(10))
+
+    # -------------------------------------------------------
+    # 11. VISUALIZE FEATURE IMPORTANCE
+    # -------------------------------------------------------
+    top = importance.head(10)
+    plots.render("churn_feature_importance.png", plots.bar, top.index, top.to_numpy(),
+                 title="Top 10 Churn Indicators" + (" (95% CI)" if errors is not None else ""),
+                 xlabel="Feature", ylabel="Importance Score",
+                 yerr=None if errors is None else errors.head(10).to_numpy(),
+                 rotation=90, figsize=(10,6))
+    print("\n✓ Feature importance chart saved as 'churn_feature_importance.png'")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,193 +2,168 @@
 # Q3 – MEDIA / MOVIE ANALYTICS FROM MYSQL (IMDb Style)
 # =======================================================
 
-import mysql.connector
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import re
 
-# -------------------------------------------------------
-# 1. CONNECT TO MYSQL
-# -------------------------------------------------------
-try:
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="admin",
-        database="testdb",
-        use_pure=True,
-        connection_timeout=10,
-        autocommit=True
-    )
-    print("✓ Database connected successfully")
-except Exception as e:
-    print(f"✗ Database connection failed: {e}")
-    exit(1)
+from db import get_connection
+from cache import cached_load
+from cleaning import genre_matrix, normalize_text, parse_number, primary_genre
+from footprint import ENABLED as DOWNCAST, downcast_series, report
+import plots
 
+# Text and raw rating columns used below (ratings are parsed by clean())
+COLUMNS = [
+    "Movie_Name", "Scraped_Name", "Director", "Writer", "Actor", "OtherInfo",
+    "Rating", "DirectorsRating", "WritersRating", "TotalFollowers", "Revenue",
+    "Budget", "Date",
+]
 
-# -------------------------------------------------------
-# 2. LOAD DATA
-# -------------------------------------------------------
-try:
-    df = pd.read_sql("SELECT * FROM q3_data", conn)
-    print(f"✓ Data loaded successfully: {len(df)} rows")
-except Exception as e:
-    print(f"✗ Data loading failed: {e}")
-    exit(1)
+# Text columns collapsed by normalize_text, and rating columns parsed to
+# numbers (float64, then downcast only where that is exact; see footprint.py)
+TEXT_COLS = ["Movie_Name", "Scraped_Name", "Director", "Writer", "Actor", "OtherInfo"]
+RATING_COLS = ["Rating", "DirectorsRating", "WritersRating", "TotalFollowers", "Revenue", "Budget"]
 
 
 # -------------------------------------------------------
-# 3. CLEAN COLUMN NAMES
+# Cleaning + analytics (also timed by benchmarks/bench_pipeline.py)
 # -------------------------------------------------------
-df.columns = df.columns.str.strip().str.replace(" ", "_")
-print("✓ Columns cleaned")
+def clean(df):
+    """Underscored column names, normalized text, numeric ratings and a Year column."""
+    df.columns = df.columns.str.strip().str.replace(" ", "_")
 
+    # Text: collapse whitespace and strip, one vectorized pass per column
+    normalize_text(df, TEXT_COLS)
 
-# -------------------------------------------------------
-# 4. TEXT CLEANING FUNCTIONS
-# -------------------------------------------------------
-def clean_text(x):
-    if pd.isna(x): return ""
-    x = str(x)
-    x = re.sub(r'[\n\r\t]', ' ', x)
-    x = re.sub(r'\s+', ' ', x)
-    return x.strip()
+    # Ratings: one regex pass per column; "$1.2M"-style suffixes are scaled
+    for col in RATING_COLS:
+        df[col] = parse_number(df[col])
+        if DOWNCAST:
+            df[col] = downcast_series(df[col])
 
-# Apply cleaning to text columns
-text_cols = ["Movie_Name", "Scraped_Name", "Director", "Writer", "Actor", "OtherInfo"]
-for col in text_cols:
-    df[col] = df[col].apply(clean_text)
+    # Year from Date
+    df["Year"] = df["Date"].astype(str).str.extract(r"(\d{4})")
+    df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
+    return df
 
 
-# -------------------------------------------------------
-# 5. CONVERT RATINGS TO NUMERIC
-# -------------------------------------------------------
-rating_cols = ["Rating", "DirectorsRating", "WritersRating", "TotalFollowers", "Revenue", "Budget"]
-
-for col in rating_cols:
-    df[col] = (
-        df[col]
-        .astype(str)
-        .str.replace(",", "")
-        .str.replace("$", "")
-        .str.extract(r"(\d+\.?\d*)")  # extract numeric part
+def aggregate(df):
+    """Rating by year, rating correlations, each movie's primary genre and ratings per genre."""
+    # ---- Average rating by year ----
+    rating_by_year = (
+        df.groupby("Year")["Rating"]
+          .mean()
+          .reset_index()
+          .dropna()
     )
-    df[col] = pd.to_numeric(df[col], errors="coerce")
 
-print("✓ Ratings converted to numeric")
-
-
-# -------------------------------------------------------
-# 6. EXTRACT YEAR FROM DATE
-# -------------------------------------------------------
-df["Year"] = df["Date"].astype(str).str.extract(r"(\d{4})")
-df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
-
-print("✓ Year extracted from Date field")
-
-
-# -------------------------------------------------------
-# 7. BASIC ANALYTICS
-# -------------------------------------------------------
+    # ---- Correlation between critics and audience ----
+    corr_matrix = df[["Rating", "DirectorsRating", "WritersRating"]].corr()
 
-# ---- Average rating by year ----
-rating_by_year = (
-    df.groupby("Year")["Rating"]
-      .mean()
-      .reset_index()
-      .dropna()
-)
+    # Multi-hot genre tags (one boolean column per genre in cleaning.GENRES)
+    genres = genre_matrix(df["OtherInfo"])
 
-# ---- Correlation between critics and audience ----
-corr_matrix = df[["Rating", "DirectorsRating", "WritersRating"]].corr()
-
-
-# -------------------------------------------------------
-# 8. GENRE EXTRACTION (from Movie_Name or OtherInfo)
-# -------------------------------------------------------
-
-def extract_genre(text):
-    """
-    Attempts to extract genres from the movie info.
-    Looks for common genres (extendable).
-    """
-    genres = [
-        "Action", "Drama", "Comedy", "Thriller", "Horror",
-        "Sci-Fi", "Fantasy", "Romance", "Adventure",
-        "Documentary", "Animation", "Crime", "Mystery"
-    ]
-    found = []
-    for g in genres:
-        if g.lower() in str(text).lower():
-            found.append(g)
-    return found[0] if found else "Unknown"
-
-df["Genre"] = df["OtherInfo"].apply(extract_genre)
-
-
-# ---- Average rating by genre ----
-top_genres = (
-    df.groupby("Genre")["Rating"]
-      .mean()
-      .reset_index()
-      .sort_values("Rating", ascending=False)
-)
-
-print("\nTop Genres by Average Rating:")
-print(top_genres.head(10))
-
-
-# -------------------------------------------------------
-# 9. VISUALIZATIONS
-# -------------------------------------------------------
-
-# ---- Rating distribution ----
-plt.figure(figsize=(8,5))
-df["Rating"].hist(bins=20)
-plt.title("Movie Rating Distribution")
-plt.xlabel("Rating")
-plt.ylabel("Count")
-plt.tight_layout()
-plt.savefig("q3_rating_distribution.png")
-plt.show()
-
-# ---- Correlation heatmap (manual) ----
-plt.figure(figsize=(6,4))
-plt.imshow(corr_matrix, cmap="viridis", interpolation="nearest")
-plt.colorbar()
-plt.xticks(range(len(corr_matrix.columns)), corr_matrix.columns, rotation=45)
-plt.yticks(range(len(corr_matrix.columns)), corr_matrix.columns)
-plt.title("Correlation: Ratings")
-plt.tight_layout()
-plt.savefig("q3_correlation_matrix.png")
-plt.show()
-
-# ---- Rating by Year trend ----
-plt.figure(figsize=(10,5))
-plt.plot(rating_by_year["Year"], rating_by_year["Rating"])
-plt.title("Average Movie Rating by Release Year")
-plt.xlabel("Year")
-plt.ylabel("Average Rating")
-plt.grid(True)
-plt.tight_layout()
-plt.savefig("q3_rating_by_year.png")
-plt.show()
-
-print("\n✓ Visualizations saved:")
-print(" - q3_rating_distribution.png")
-print(" - q3_correlation_matrix.png")
-print(" - q3_rating_by_year.png")
-
-# -------------------------------------------------------
-# 10. OUTPUT SUMMARY
-# -------------------------------------------------------
-print("\n===== SUMMARY =====")
-print("Correlation Matrix:")
-print(corr_matrix)
-
-print("\nGenres Ranked by Rating:")
-print(top_genres)
-
-print("\nRating Trend by Year:")
-print(rating_by_year)
+    # ---- Average rating by genre (every genre a movie is tagged with) ----
+    tagged = genres.assign(Unknown=~genres.any(axis=1))
+    # Rating where the movie carries the genre, NaN elsewhere; mean() skips NaN
+    genre_ratings = pd.DataFrame(
+        np.where(tagged, df["Rating"].to_numpy(dtype=float)[:, None], np.nan),
+        columns=tagged.columns,
+    )
+    top_genres = (
+        pd.DataFrame({"Rating": genre_ratings.mean(), "Movies": tagged.sum()})
+          .rename_axis("Genre")
+          .query("Movies > 0")
+          .reset_index()
+          .sort_values("Rating", ascending=False)
+    )
+    return {
+        "rating_by_year": rating_by_year,
+        "corr": corr_matrix,
+        "genre": primary_genre(genres),
+        "top_genres": top_genres,
+    }
+
+
+def main():
+    # -------------------------------------------------------
+    # 1. CONNECT TO MYSQL
+    # -------------------------------------------------------
+    try:
+        conn = get_connection()
+        print("✓ Database connected successfully")
+    except Exception as e:
+        print(f"✗ Database connection failed: {e}")
+        exit(1)
+
+
+    # -------------------------------------------------------
+    # 2. LOAD DATA
+    # -------------------------------------------------------
+    try:
+        df = cached_load(conn, "q3_data", COLUMNS)
+        print(f"✓ Data loaded successfully: {len(df)} rows")
+    except Exception as e:
+        print(f"✗ Data loading failed: {e}")
+        exit(1)
+
+
+    # -------------------------------------------------------
+    # 3-6. CLEAN COLUMN NAMES, TEXT, RATINGS, YEAR
+    # -------------------------------------------------------
+    df = clean(df)
+    print("✓ Columns, text, ratings and Year cleaned")
+    report("q3_data after cleaning", df)
+
+
+    # -------------------------------------------------------
+    # 7. BASIC ANALYTICS + 8. GENRE EXTRACTION
+    # -------------------------------------------------------
+    summary = aggregate(df)
+    rating_by_year = summary["rating_by_year"]
+    corr_matrix = summary["corr"]
+    df["Genre"] = summary["genre"]
+    top_genres = summary["top_genres"]
+
+    print("\nTop Genres by Average Rating:")
+    print(top_genres.head(10))
+
+
+    # -------------------------------------------------------
+    # 9. VISUALIZATIONS
+    # -------------------------------------------------------
+
+    charts = plots.Renderer()
+
+    # ---- Rating distribution ----
+    charts.submit("q3_rating_distribution.png", plots.hist, df["Rating"].dropna().to_numpy(), bins=20,
+                  title="Movie Rating Distribution", xlabel="Rating", ylabel="Count", grid=True,
+                  figsize=(8,5))
+
+    # ---- Correlation heatmap (manual) ----
+    charts.submit("q3_correlation_matrix.png", plots.matrix, corr_matrix,
+                  title="Correlation: Ratings", figsize=(6,4))
+
+    # ---- Rating by Year trend ----
+    charts.submit("q3_rating_by_year.png", plots.line, rating_by_year["Year"], rating_by_year["Rating"],
+                  title="Average Movie Rating by Release Year", xlabel="Year", ylabel="Average Rating",
+                  grid=True, figsize=(10,5))
+
+    # -------------------------------------------------------
+    # 10. OUTPUT SUMMARY
+    # -------------------------------------------------------
+    print("\n===== SUMMARY =====")
+    print("Correlation Matrix:")
+    print(corr_matrix)
+
+    print("\nGenres Ranked by Rating:")
+    print(top_genres)
+
+    print("\nRating Trend by Year:")
+    print(rating_by_year)
+
+    print("\nVisualizations:")
+    charts.wait()
+
+
+if __name__ == "__main__":
+    main()
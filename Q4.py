@@ -6,273 +6,378 @@
 # - Safe aliasing for AREA_NAME and Crm_Cd_Desc
 # - Basic geospatial extraction if lat/lon present (optional)
 # - Saves simple visualizations and CSV summaries
+# - Optional incremental mode (Q4_INCREMENTAL=1): only rows above the
+#   last run's high-water mark are fetched and merged into saved counts
 # ================================================================
 
-import mysql.connector
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import re
 import os
-from datetime import datetime
+
+from db import get_connection
+from cache import cached_load
+from cleaning import extract_coords, parse_hhmm, recode
+from engines import crime_summary
+from footprint import report
+from loader import load_table, quote_ident, table_columns
+import plots
 
 # -----------------------
 # CONFIG - update as needed
+# (database settings live in db.py / db.ini)
 # -----------------------
-DB_CONFIG = {
-    "host": "localhost",
-    "user": "root",
-    "password": "admin",
-    "database": "testdb",
-    "use_pure": True,
-    "connection_timeout": 10,
-}
-
 TABLE_NAME = "q5_data"
 OUTPUT_DIR = "./q4_outputs"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# -----------------------
-# 1) Connect to MySQL
-# -----------------------
-try:
-    conn = mysql.connector.connect(**DB_CONFIG)
-    print("✓ Database connected successfully")
-except Exception as e:
-    print(f"✗ Database connection failed: {e}")
-    raise
+# Aggregation engine: "pandas" (default), "duckdb" or "polars" (see engines.py)
+ENGINE = os.environ.get("Q4_ENGINE", "pandas").lower()
 
-# -----------------------
-# 2) Load data
-# -----------------------
-try:
-    df = pd.read_sql(f"SELECT * FROM {TABLE_NAME}", conn)
-    print(f"✓ Loaded table '{TABLE_NAME}' — rows: {len(df)}")
-except Exception as e:
-    print(f"✗ Failed to read table '{TABLE_NAME}': {e}")
-    raise
-
-# -----------------------
-# 3) Normalize column names (strip spaces)
-# -----------------------
-df.columns = df.columns.str.strip()
-# Keep a copy
-orig_len = len(df)
+# Incremental refresh: rows with INCREMENTAL_KEY above the stored high-water
+# mark are the only ones read; their counts are merged into STATE_FILE.
+# Assumes the key only grows (new reports get new DR_NO values) and that
+# existing rows are not edited — run without Q4_INCREMENTAL to rebuild.
+INCREMENTAL = os.environ.get("Q4_INCREMENTAL", "0") == "1"
+INCREMENTAL_KEY = "DR_NO"
+STATE_FILE = os.path.join(OUTPUT_DIR, "q4_state.pkl")
 
-# -----------------------
-# 4) Flexible Date Parsing
-#    - Date_Rptd and DATE_OCC may be stored as strings in many formats
-#    - Use pd.to_datetime with errors="coerce" so invalid -> NaT
-# -----------------------
-# Try direct parse; this will handle most common formats (YYYY-MM-DD, MM/DD/YYYY, etc.)
-df["Date_Rptd"] = pd.to_datetime(df.get("Date_Rptd"), errors="coerce")
-df["DATE_OCC"]   = pd.to_datetime(df.get("DATE_OCC"), errors="coerce")
-
-print("✓ Date parsing summary:")
-print(f"  Date_Rptd: {df['Date_Rptd'].notna().sum()}/{len(df)} parsed")
-print(f"  DATE_OCC : {df['DATE_OCC'].notna().sum()}/{len(df)} parsed")
-
-# If DATE_OCC mostly NaT, attempt some common fallback formats heuristics:
-if df["DATE_OCC"].notna().sum() < max(1, int(len(df) * 0.2)):
-    # Try parsing with dayfirst True (handles dd/mm/YYYY)
-    fallback = pd.to_datetime(df.get("DATE_OCC"), errors="coerce", dayfirst=True)
-    improved = fallback.notna().sum()
-    if improved > df["DATE_OCC"].notna().sum():
-        df["DATE_OCC"] = fallback
-        print(f"  ✓ Improved DATE_OCC parsing using dayfirst. Now parsed: {improved}/{len(df)}")
 
-# -----------------------
-# 5) Robust TIME_OCC parsing
-#    TIME_OCC can be '1110', '1', '635', sometimes non-digit — handle safely
-# -----------------------
-def fix_time(x):
-    if pd.isna(x):
+def load_state():
+    """Return the saved aggregate state, or None when there is no usable one."""
+    if not os.path.exists(STATE_FILE):
         return None
-    s = str(x).strip()
-    # Remove any non-digit characters (but keep digits)
-    s_digits = re.sub(r"\D", "", s)
-    if s_digits == "":
-        return None
-    # Ensure 4 digits (HHMM)
-    s_digits = s_digits.zfill(4)
-    try:
-        t = pd.to_datetime(s_digits, format="%H%M", errors="coerce").time()
-        return t
-    except Exception:
+    state = pd.read_pickle(STATE_FILE)
+    if state.get("key") != INCREMENTAL_KEY or state.get("high_water") is None:
         return None
+    return state
 
-df["TIME_OCC_parsed"] = df.get("TIME_OCC").apply(fix_time)
 
-print(f"✓ TIME_OCC parsed (non-null): {df['TIME_OCC_parsed'].notna().sum()}/{len(df)}")
+def save_state(state):
+    pd.to_pickle(state, STATE_FILE + ".tmp")
+    os.replace(STATE_FILE + ".tmp", STATE_FILE)
+
+
+def merge_counts(previous, current, key):
+    """Add the Incidents of two count tables keyed on `key`."""
+    merged = pd.concat([previous, current], ignore_index=True)
+    merged = merged.groupby(key)["Incidents"].sum().reset_index()
+    merged["Incidents"] = merged["Incidents"].astype("int64")
+    return merged
 
-# -----------------------
-# 6) Extract coordinates if LOCATION contains lat/lon pairs
-#    If LOCATION is an address (as in your sample), this will remain NaN.
-# -----------------------
-def extract_coord(text):
-    if pd.isna(text):
-        return (np.nan, np.nan)
-    s = str(text)
-    # Try to match explicit lat/lon patterns like "(34.05, -118.24)" or "34.05, -118.24"
-    m = re.search(r"([-+]?\d{1,3}\.\d+)[, ]+\s*([-+]?\d{1,3}\.\d+)", s)
-    if m:
-        try:
-            return float(m.group(1)), float(m.group(2))
-        except:
-            return (np.nan, np.nan)
-    return (np.nan, np.nan)
-
-coords = df.get("LOCATION", pd.Series([np.nan]*len(df))).apply(extract_coord)
-df["Lat"] = coords.apply(lambda x: x[0] if isinstance(x, (tuple, list)) and len(x) >= 2 else np.nan)
-df["Lon"] = coords.apply(lambda x: x[1] if isinstance(x, (tuple, list)) and len(x) >= 2 else np.nan)
-print(f"✓ Coordinates found: Lat non-null {df['Lat'].notna().sum()}, Lon non-null {df['Lon'].notna().sum()}")
 
 # -----------------------
-# 7) Safe aliasing for important columns
+# Cleaning + aggregation (also timed by benchmarks/bench_pipeline.py)
 # -----------------------
-# Build a lowercase map to find similar columns flexibly
-cols_lower = {c.lower(): c for c in df.columns}
-
-def find_col(possible_names):
-    # exact names first
-    for name in possible_names:
-        if name.lower() in cols_lower:
-            return cols_lower[name.lower()]
-    # substring match
-    for lname, orig in cols_lower.items():
+def clean(df, area_col="AREA_NAME", crime_col="Crm_Cd_Desc", fallback_date=None, native_coords=True):
+    """
+    Steps 4-7 on a loaded frame: parsed dates and TIME_OCC, Lat/Lon and
+    the area / crime aliases. The column arguments are what step 2
+    resolved against the table; the defaults are q5_data's own names.
+    """
+    # -----------------------
+    # 4) Flexible Date Parsing
+    #    - Date_Rptd and DATE_OCC may be stored as strings in many formats
+    #    - Use pd.to_datetime with errors="coerce" so invalid -> NaT
+    # -----------------------
+    # Try direct parse; this will handle most common formats (YYYY-MM-DD, MM/DD/YYYY, etc.)
+    df["Date_Rptd"] = pd.to_datetime(df.get("Date_Rptd"), errors="coerce")
+    df["DATE_OCC"]   = pd.to_datetime(df.get("DATE_OCC"), errors="coerce")
+
+    print("✓ Date parsing summary:")
+    print(f"  Date_Rptd: {df['Date_Rptd'].notna().sum()}/{len(df)} parsed")
+    print(f"  DATE_OCC : {df['DATE_OCC'].notna().sum()}/{len(df)} parsed")
+
+    # If DATE_OCC mostly NaT, attempt some common fallback formats heuristics:
+    if df["DATE_OCC"].notna().sum() < max(1, int(len(df) * 0.2)):
+        # Try parsing with dayfirst True (handles dd/mm/YYYY)
+        fallback = pd.to_datetime(df.get("DATE_OCC"), errors="coerce", dayfirst=True)
+        improved = fallback.notna().sum()
+        if improved > df["DATE_OCC"].notna().sum():
+            df["DATE_OCC"] = fallback
+            print(f"  ✓ Improved DATE_OCC parsing using dayfirst. Now parsed: {improved}/{len(df)}")
+
+    # -----------------------
+    # 5) Robust TIME_OCC parsing
+    #    TIME_OCC can be '1110', '1', '635', sometimes non-digit — handle safely
+    #    Parsed column-wise to a time-of-day timedelta; invalid values -> NaT
+    # -----------------------
+    df["TIME_OCC_parsed"] = pd.to_timedelta(parse_hhmm(df.get("TIME_OCC")), unit="m")
+
+    print(f"✓ TIME_OCC parsed (non-null): {df['TIME_OCC_parsed'].notna().sum()}/{len(df)}")
+
+    # -----------------------
+    # 6) Coordinates: native LAT/LON columns when the table has them,
+    #    otherwise lat/lon pairs inside LOCATION.
+    #    If LOCATION is an address (as in your sample), this will remain NaN.
+    # -----------------------
+    if native_coords:
+        df["Lat"] = pd.to_numeric(df["LAT"], errors="coerce").astype(np.float64)
+        df["Lon"] = pd.to_numeric(df["LON"], errors="coerce").astype(np.float64)
+    elif "LOCATION" in df.columns:
+        df[["Lat", "Lon"]] = extract_coords(df["LOCATION"])
+    else:
+        df["Lat"] = np.nan
+        df["Lon"] = np.nan
+    print(f"✓ Coordinates found: Lat non-null {df['Lat'].notna().sum()}, Lon non-null {df['Lon'].notna().sum()}")
+
+    # -----------------------
+    # 7) Safe aliasing for important columns (resolved in step 2)
+    # -----------------------
+    # AREA_NAME alias
+    # Recoded per category, so the aliases stay categorical (see schema.py)
+    if area_col:
+        df["AREA_NAME_alias"] = recode(df[area_col], str, fill="Unknown")
+    else:
+        df["AREA_NAME_alias"] = "Unknown"
+
+    # Crime description alias
+    if crime_col:
+        df["Crm_Cd_Desc_alias"] = recode(df[crime_col], str, fill="Unknown")
+    else:
+        df["Crm_Cd_Desc_alias"] = "Unknown"
+
+    # Ensure DATE_OCC exists (already parsed above)
+    if "DATE_OCC" not in df.columns or df["DATE_OCC"].isna().all():
+        # try other candidate date columns
+        if fallback_date:
+            df["DATE_OCC"] = pd.to_datetime(df[fallback_date], errors="coerce")
+            print(f"✓ Mapped fallback '{fallback_date}' -> DATE_OCC parsed non-null: {df['DATE_OCC'].notna().sum()}")
+        else:
+            print("⚠ No usable date column found. Time-series will be empty.")
+    return df
+
+
+def aggregate(df, engine=ENGINE):
+    """
+    Steps 9-10: daily/weekly/monthly/yearly counts and top areas / crime
+    types over the rows with a valid DATE_OCC (engines.crime_summary), or
+    empty tables when there are none.
+    """
+    if df["DATE_OCC"].notna().any():
+        return crime_summary(df, engine)
+    return {
+        "yearly_crime": pd.DataFrame(columns=["Year", "Incidents"]),
+        "monthly_crime": pd.DataFrame(columns=["Month", "Incidents"]),
+        "weekly_crime": pd.DataFrame(columns=["Week", "Incidents"]),
+        "daily_crime": pd.DataFrame(columns=["Day", "Incidents"]),
+        "top_areas": pd.DataFrame(columns=["AREA_NAME_alias", "Incidents"]),
+        "top_crimes": pd.DataFrame(columns=["Crm_Cd_Desc_alias", "Incidents"]),
+    }
+
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # -----------------------
+    # 1) Connect to MySQL
+    # -----------------------
+    try:
+        conn = get_connection()
+        print("✓ Database connected successfully")
+    except Exception as e:
+        print(f"✗ Database connection failed: {e}")
+        raise
+
+    # -----------------------
+    # 2) Resolve the columns this analysis needs
+    #    Aliases are matched against the table schema so only the
+    #    matching columns are fetched, not the whole table.
+    # -----------------------
+    try:
+        # stripped name -> name as stored in MySQL
+        raw_names = {c.strip(): c for c in table_columns(conn, TABLE_NAME)}
+    except Exception as e:
+        print(f"✗ Failed to read columns of '{TABLE_NAME}': {e}")
+        raise
+
+    # Build a lowercase map to find similar columns flexibly
+    cols_lower = {c.lower(): c for c in raw_names}
+
+    def find_col(possible_names):
+        # exact names first
         for name in possible_names:
-            if name.lower() in lname:
-                return orig
-    return None
-
-# AREA_NAME alias
-area_col = find_col(["AREA_NAME", "area_name", "area", "neighborhood", "beat", "location"])
-if area_col:
-    df["AREA_NAME_alias"] = df[area_col].astype(str).fillna("Unknown")
-else:
-    df["AREA_NAME_alias"] = "Unknown"
-
-# Crime description alias
-crime_col = find_col(["Crm_Cd_Desc", "crm_cd_desc", "crm", "crime", "offense", "description"])
-if crime_col:
-    df["Crm_Cd_Desc_alias"] = df[crime_col].astype(str).fillna("Unknown")
-else:
-    df["Crm_Cd_Desc_alias"] = "Unknown"
-
-# Ensure DATE_OCC exists (already parsed above)
-if "DATE_OCC" not in df.columns or df["DATE_OCC"].isna().all():
-    # try other candidate date columns
+            if name.lower() in cols_lower:
+                return cols_lower[name.lower()]
+        # substring match
+        for lname, orig in cols_lower.items():
+            for name in possible_names:
+                if name.lower() in lname:
+                    return orig
+        return None
+
+    area_col = find_col(["AREA_NAME", "area_name", "area", "neighborhood", "beat", "location"])
+    crime_col = find_col(["Crm_Cd_Desc", "crm_cd_desc", "crm", "crime", "offense", "description"])
     fallback_date = find_col(["date_rptd", "date", "date_reported", "date_occ"])
-    if fallback_date:
-        df["DATE_OCC"] = pd.to_datetime(df[fallback_date], errors="coerce")
-        print(f"✓ Mapped fallback '{fallback_date}' -> DATE_OCC parsed non-null: {df['DATE_OCC'].notna().sum()}")
+
+    # Native LAT/LON columns are used when the table has them
+    native_coords = "LAT" in raw_names and "LON" in raw_names
+
+    # LOCATION is only parsed for coordinates when LAT/LON are missing
+    wanted = ["Date_Rptd", "DATE_OCC", "TIME_OCC", area_col, crime_col, fallback_date]
+    wanted += ["LAT", "LON"] if native_coords else ["LOCATION"]
+
+    incremental = INCREMENTAL
+    state = None
+    if incremental:
+        if INCREMENTAL_KEY in raw_names:
+            wanted.append(INCREMENTAL_KEY)
+            state = load_state()
+            if state is None:
+                print(f"⚠ No saved state in {STATE_FILE}; running a full refresh")
+        else:
+            print(f"⚠ '{INCREMENTAL_KEY}' not found in '{TABLE_NAME}'; running a full refresh")
+            incremental = False
+
+    load_cols = list(dict.fromkeys(raw_names[c] for c in wanted if c in raw_names))
+
+    # -----------------------
+    # 3) Load data
+    # -----------------------
+    try:
+        if state is not None:
+            df = load_table(conn, TABLE_NAME, load_cols,
+                            where=f"{quote_ident(raw_names[INCREMENTAL_KEY])} > %s",
+                            params=(state["high_water"],))
+            print(f"✓ Loaded {len(df)} new rows from '{TABLE_NAME}' "
+                  f"({INCREMENTAL_KEY} > {state['high_water']})")
+        else:
+            df = cached_load(conn, TABLE_NAME, load_cols)
+            print(f"✓ Loaded table '{TABLE_NAME}' — rows: {len(df)}, columns: {len(load_cols)}")
+    except Exception as e:
+        print(f"✗ Failed to read table '{TABLE_NAME}': {e}")
+        raise
+
+    # Normalize column names (strip spaces)
+    df.columns = df.columns.str.strip()
+
+    # -----------------------
+    # 4)-7) Dates, TIME_OCC, coordinates and aliases (see clean above)
+    # -----------------------
+    df = clean(df, area_col, crime_col, fallback_date, native_coords)
+
+    report(f"{TABLE_NAME} after cleaning", df)
+
+    # -----------------------
+    # 8) Filter rows with a valid DATE_OCC but do not drop everything blindly
+    #    We'll keep rows that have a parsed DATE_OCC; if too many are missing warn user.
+    # -----------------------
+    total_rows = len(df)
+    has_date = df["DATE_OCC"].notna()
+    valid_date_count = int(has_date.sum())
+    if valid_date_count == 0:
+        print("✗ No valid DATE_OCC values found. Aborting time-series and geography steps.")
     else:
-        print("⚠ No usable date column found. Time-series will be empty.")
+        print(f"✓ Rows with valid DATE_OCC: {valid_date_count}/{total_rows}")
 
-# -----------------------
-# 8) Filter rows with a valid DATE_OCC but do not drop everything blindly
-#    We'll keep rows that have a parsed DATE_OCC; if too many are missing warn user.
-# -----------------------
-total_rows = len(df)
-valid_date_count = df["DATE_OCC"].notna().sum()
-if valid_date_count == 0:
-    print("✗ No valid DATE_OCC values found. Aborting time-series and geography steps.")
-else:
-    print(f"✓ Rows with valid DATE_OCC: {valid_date_count}/{total_rows}")
+    # -----------------------
+    # 9) Daily / Weekly / Monthly / Yearly counts
+    # 10) Top Areas & Top Crime Types
+    #    Only rows with a valid DATE_OCC are counted; crime_summary skips the
+    #    rest itself, so the frame is not filtered or copied here.
+    # -----------------------
+    summary = aggregate(df)
+    yearly_crime = summary["yearly_crime"]
+    monthly_crime = summary["monthly_crime"]
+    weekly_crime = summary["weekly_crime"]
+    daily_crime = summary["daily_crime"]
+    top_areas = summary["top_areas"]
+    top_crimes = summary["top_crimes"]
+    if valid_date_count > 0:
+        print(f"✓ Computed daily/weekly/monthly/yearly aggregates ({ENGINE} engine)")
 
-# Keep only rows with valid DATE_OCC for time-series & top-area analysis
-df_time = df[df["DATE_OCC"].notna()].copy()
+    # -----------------------
+    # 10b) Incremental merge with the counts of earlier runs
+    # -----------------------
+    if state is not None:
+        daily_crime = merge_counts(state["daily_crime"], daily_crime, "Day")
+        weekly_crime = merge_counts(state["weekly_crime"], weekly_crime, "Week")
+        monthly_crime = merge_counts(state["monthly_crime"], monthly_crime, "Month")
+        yearly_crime = merge_counts(state["yearly_crime"], yearly_crime, "Year")
+        top_areas = merge_counts(state["top_areas"], top_areas, "AREA_NAME_alias").sort_values("Incidents", ascending=False)
+        top_crimes = merge_counts(state["top_crimes"], top_crimes, "Crm_Cd_Desc_alias").sort_values("Incidents", ascending=False)
+        print(f"✓ Merged {valid_date_count} new rows into saved aggregates")
 
-# -----------------------
-# 9) Derive time features (Day / Week / Month / Year)
-# -----------------------
-if len(df_time) > 0:
-    df_time["Day"] = df_time["DATE_OCC"].dt.date
-    df_time["Week"] = df_time["DATE_OCC"].dt.isocalendar().week
-    df_time["Month"] = df_time["DATE_OCC"].dt.to_period("M")
-    df_time["Year"] = df_time["DATE_OCC"].dt.year
-
-    # Monthly / Weekly / Daily groupings
-    monthly_crime = df_time.groupby("Month").size().reset_index(name="Incidents")
-    weekly_crime = df_time.groupby("Week").size().reset_index(name="Incidents")
-    daily_crime  = df_time.groupby("Day").size().reset_index(name="Incidents")
-    print("✓ Computed daily/weekly/monthly aggregates")
-else:
-    monthly_crime = pd.DataFrame(columns=["Month", "Incidents"])
-    weekly_crime = pd.DataFrame(columns=["Week", "Incidents"])
-    daily_crime = pd.DataFrame(columns=["Day", "Incidents"])
+    print("\nIncidents per year:")
+    print(yearly_crime.to_string(index=False))
+    print("\nTop Areas (top 10):")
+    print(top_areas.head(10).to_string(index=False))
+    print("\nTop Crime Types (top 10):")
+    print(top_crimes.head(10).to_string(index=False))
 
-# -----------------------
-# 10) Top Areas & Top Crime Types
-# -----------------------
-top_areas = df_time.groupby("AREA_NAME_alias").size().reset_index(name="Incidents").sort_values("Incidents", ascending=False)
-top_crimes = df_time.groupby("Crm_Cd_Desc_alias").size().reset_index(name="Incidents").sort_values("Incidents", ascending=False)
+    # -----------------------
+    # 11) Plots (save to OUTPUT_DIR)
+    # -----------------------
+    charts = plots.Renderer()
 
-print("\nTop Areas (top 10):")
-print(top_areas.head(10).to_string(index=False))
-print("\nTop Crime Types (top 10):")
-print(top_crimes.head(10).to_string(index=False))
+    # Plot: Top 10 areas bar chart
+    if not top_areas.empty:
+        top10 = top_areas.head(10)
+        charts.submit(os.path.join(OUTPUT_DIR, "q4_top_areas.png"), plots.bar,
+                      top10["AREA_NAME_alias"], top10["Incidents"], title="Top 10 Crime Areas",
+                      ylabel="Incidents", color="tab:green", rotation=45, ha="right", figsize=(10,6))
+    else:
+        print("⚠ Top Areas plot skipped (no data).")
 
-# -----------------------
-# 11) Plots (save to OUTPUT_DIR)
-# -----------------------
-# Plot: Top 10 areas bar chart
-if not top_areas.empty:
-    plt.figure(figsize=(10,6))
-    top_areas.head(10).plot.bar(x="AREA_NAME_alias", y="Incidents", legend=False, color="tab:green")
-    plt.xticks(rotation=45, ha="right")
-    plt.title("Top 10 Crime Areas")
-    plt.ylabel("Incidents")
-    plt.tight_layout()
-    path_top_areas = os.path.join(OUTPUT_DIR, "q4_top_areas.png")
-    plt.savefig(path_top_areas)
-    plt.close()
-    print(f"✓ Saved Top Areas chart -> {path_top_areas}")
-else:
-    print("⚠ Top Areas plot skipped (no data).")
-
-# Plot: Monthly trend
-if not monthly_crime.empty:
-    plt.figure(figsize=(10,6))
-    # convert Period to string for plotting if necessary
-    monthly_crime_plot = monthly_crime.copy()
-    monthly_crime_plot["Month_str"] = monthly_crime_plot["Month"].astype(str)
-    plt.plot(monthly_crime_plot["Month_str"], monthly_crime_plot["Incidents"], marker="o")
-    plt.xticks(rotation=45, ha="right")
-    plt.title("Monthly Crime Trend")
-    plt.xlabel("Month")
-    plt.ylabel("Incidents")
-    plt.tight_layout()
-    path_monthly = os.path.join(OUTPUT_DIR, "q4_monthly_trend.png")
-    plt.savefig(path_monthly)
-    plt.close()
-    print(f"✓ Saved Monthly Trend chart -> {path_monthly}")
-else:
-    print("⚠ Monthly trend plot skipped (no data).")
+    # Plot: Monthly trend
+    if not monthly_crime.empty:
+        charts.submit(os.path.join(OUTPUT_DIR, "q4_monthly_trend.png"), plots.line,
+                      monthly_crime["Month"].astype(str), monthly_crime["Incidents"],
+                      title="Monthly Crime Trend", xlabel="Month", ylabel="Incidents", marker="o",
+                      rotation=45, ha="right", figsize=(10,6))
+    else:
+        print("⚠ Monthly trend plot skipped (no data).")
 
-# -----------------------
-# 12) Export summaries (CSV) for quick review
-# -----------------------
-top_areas.head(100).to_csv(os.path.join(OUTPUT_DIR, "q4_top_areas.csv"), index=False)
-top_crimes.head(100).to_csv(os.path.join(OUTPUT_DIR, "q4_top_crimes.csv"), index=False)
-monthly_crime.to_csv(os.path.join(OUTPUT_DIR, "q4_monthly_crime.csv"), index=False)
-daily_crime.to_csv(os.path.join(OUTPUT_DIR, "q4_daily_crime.csv"), index=False)
-print(f"✓ Exported CSV summaries to {OUTPUT_DIR}")
+    # -----------------------
+    # 12) Export summaries (CSV) for quick review
+    # -----------------------
+    top_areas.head(100).to_csv(os.path.join(OUTPUT_DIR, "q4_top_areas.csv"), index=False)
+    top_crimes.head(100).to_csv(os.path.join(OUTPUT_DIR, "q4_top_crimes.csv"), index=False)
+    yearly_crime.to_csv(os.path.join(OUTPUT_DIR, "q4_yearly_crime.csv"), index=False)
+    monthly_crime.to_csv(os.path.join(OUTPUT_DIR, "q4_monthly_crime.csv"), index=False)
+    daily_crime.to_csv(os.path.join(OUTPUT_DIR, "q4_daily_crime.csv"), index=False)
+    print(f"✓ Exported CSV summaries to {OUTPUT_DIR}")
+    charts.wait()
 
-# -----------------------
-# 13) Brief Console Summary
-# -----------------------
-print("\n================ SUMMARY ================")
-print(f"Input rows: {total_rows}")
-print(f"Rows with parsed DATE_OCC: {valid_date_count}")
-print(f"Unique areas detected: {df_time['AREA_NAME_alias'].nunique() if len(df_time)>0 else 0}")
-print(f"Unique crime types detected: {df_time['Crm_Cd_Desc_alias'].nunique() if len(df_time)>0 else 0}")
-print("Files saved in:", os.path.abspath(OUTPUT_DIR))
-print("==========================================")
-
-# Optionally display the first few cleaned rows for verification
-print("\nSample cleaned rows:")
-print(df_time.head(5).to_string(index=False))
-
-# Done
-conn.close()
+    # Persist the full counts and the new high-water mark only after the
+    # outputs are written, so a failed run is simply repeated next time.
+    if incremental:
+        high_water = state["high_water"] if state is not None else None
+        if len(df) > 0:
+            new_max = df[INCREMENTAL_KEY].max()
+            new_max = new_max.item() if hasattr(new_max, "item") else new_max
+            high_water = new_max if high_water is None else max(high_water, new_max)
+        rows_seen = (state["rows"] if state is not None else 0) + total_rows
+        save_state({
+            "key": INCREMENTAL_KEY,
+            "high_water": high_water,
+            "rows": rows_seen,
+            "daily_crime": daily_crime,
+            "weekly_crime": weekly_crime,
+            "monthly_crime": monthly_crime,
+            "yearly_crime": yearly_crime,
+            "top_areas": top_areas,
+            "top_crimes": top_crimes,
+        })
+        print(f"✓ Saved incremental state ({INCREMENTAL_KEY} <= {high_water}) -> {STATE_FILE}")
+
+    # -----------------------
+    # 13) Brief Console Summary
+    # -----------------------
+    print("\n================ SUMMARY ================")
+    print(f"Input rows: {total_rows}")
+    print(f"Rows with parsed DATE_OCC: {valid_date_count}")
+    if incremental:
+        print(f"Rows aggregated across runs: {rows_seen}")
+    print(f"Unique areas detected: {len(top_areas)}")
+    print(f"Unique crime types detected: {len(top_crimes)}")
+    print("Files saved in:", os.path.abspath(OUTPUT_DIR))
+    print("==========================================")
+
+    # Optionally display the first few cleaned rows for verification
+    print("\nSample cleaned rows:")
+    print(df.loc[has_date[has_date].index[:5]].to_string(index=False))
+
+    # Done
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
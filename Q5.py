@@ -1,172 +1,196 @@
 # ============================================================
 # 1. IMPORT LIBRARIES
 # ============================================================
-import mysql.connector
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-print("✔ Libraries loaded successfully!\n")
-
-# ============================================================
-# 2. CONNECT TO MYSQL AND LOAD DATA
-# ============================================================
-print("🔌 Connecting to MySQL...")
-
-try:
-    conn = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="admin",
-        database="testdb",
-        use_pure=True
-    )
-    print("✔ Connected to MySQL database successfully!")
-except Exception as e:
-    print("❌ ERROR: Could not connect to MySQL.")
-    print("Error message:", e)
-    exit(1)
-
-# Load table q4_data
-try:
-    df = pd.read_sql("SELECT * FROM q4_data", conn)
-    print(f"\n📌 RAW DATA PREVIEW ({len(df)} rows):")
-    print(df.head())
-except Exception as e:
-    print("❌ ERROR loading dataset from MySQL:")
-    print(e)
-    exit(1)
-
-# ============================================================
-# 3. CLEAN DATA
-# ============================================================
-print("\n🔧 Cleaning dataset...")
-
-# Strip column names
-df.columns = df.columns.str.strip()
-
-# Convert numeric columns
-numeric_cols = ['age', 'trestbps', 'chol', 'thalch', 'oldpeak', 'num']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-# Convert categorical columns
-categorical_cols = ['sex', 'cp', 'fbs', 'restecg', 'exang', 'slope', 'ca', 'thal', 'dataset']
-for col in categorical_cols:
-    df[col] = df[col].astype(str).str.strip()
-
-# Fill missing numeric values with median
-df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
-
-# Replace 'nan' strings with 'Unknown' in categorical columns
-df[categorical_cols] = df[categorical_cols].replace("nan", "Unknown")
-
-print("✔ Data cleaned successfully!\n")
-print("📌 CLEANED DATA INFO:")
-print(df.info())
-
-# ============================================================
-# 4. SUMMARY STATISTICS
-# ============================================================
-print("\n📊 SUMMARY STATISTICS:")
-print(df.describe())
-
-# ============================================================
-# 5. CORRELATION ANALYSIS
-# ============================================================
-print("\n📌 CORRELATION WITH HEART DISEASE (num):")
-corr_matrix = df.corr(numeric_only=True)
-print(corr_matrix['num'].sort_values(ascending=False))
-
-# Heatmap for numeric correlations
-plt.figure(figsize=(10,8))
-sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap="coolwarm")
-plt.title("Correlation Heatmap")
-plt.show()
-
-# ============================================================
-# 6. AGE VS HEART DISEASE
-# ============================================================
-plt.figure(figsize=(8,5))
-plt.scatter(df['age'], df['num'], alpha=0.6)
-plt.xlabel("Age")
-plt.ylabel("Heart Disease Score (num)")
-plt.title("Age vs Heart Disease Severity")
-plt.show()
-
-# ============================================================
-# 7. GENDER ANALYSIS
-# ============================================================
-gender_result = df.groupby('sex')['num'].mean().reset_index()
-print("\n📌 AVERAGE HEART DISEASE SCORE BY GENDER:")
-print(gender_result)
-
-plt.figure(figsize=(7,4))
-sns.barplot(x='sex', y='num', data=gender_result)
-plt.xlabel("Sex (1 = Male, 0 = Female)")
-plt.ylabel("Average Disease Severity")
-plt.title("Heart Disease Severity by Sex")
-plt.show()
-
-# ============================================================
-# 8. CHOLESTEROL VS HEART DISEASE
-# ============================================================
-plt.figure(figsize=(8,5))
-plt.scatter(df['chol'], df['num'], alpha=0.6, color='orange')
-plt.xlabel("Cholesterol Level")
-plt.ylabel("Heart Disease Score")
-plt.title("Cholesterol vs Heart Disease Severity")
-plt.show()
-
-# ============================================================
-# 9. BLOOD PRESSURE VS HEART DISEASE
-# ============================================================
-plt.figure(figsize=(8,5))
-plt.scatter(df['trestbps'], df['num'], alpha=0.6, color='green')
-plt.xlabel("Resting Blood Pressure (trestbps)")
-plt.ylabel("Heart Disease Score")
-plt.title("Blood Pressure vs Heart Disease Severity")
-plt.show()
-
-# ============================================================
-# 10. AGE GROUP ANALYSIS
-# ============================================================
-df['age_group'] = pd.cut(df['age'], bins=[29,39,49,59,69,79,89], labels=['30-39','40-49','50-59','60-69','70-79','80-89'])
-age_group_result = df.groupby('age_group')['num'].mean().reset_index()
-
-print("\n📌 AVERAGE HEART DISEASE SCORE BY AGE GROUP:")
-print(age_group_result)
-
-plt.figure(figsize=(8,5))
-sns.barplot(x='age_group', y='num', data=age_group_result, palette="viridis")
-plt.xlabel("Age Group")
-plt.ylabel("Average Heart Disease Score")
-plt.title("Heart Disease Severity by Age Group")
-plt.show()
-
-# ============================================================
-# 11. FINAL INSIGHTS
-# ============================================================
-print("\n=======================")
-print("📌 FINAL ANALYTICS SUMMARY")
-print("=======================\n")
-
-print("🔹 Strongest positive correlations with heart disease:")
-print(corr_matrix['num'].sort_values(ascending=False).head())
-
-print("\n🔹 Average disease severity by gender:")
-print(gender_result)
-
-print("\n🔹 Average disease severity by age group:")
-print(age_group_result)
-
-print("\n🔹 Key Insights:")
-print("""
-- Older individuals show higher heart disease levels.
-- Males typically show higher severity than females.
-- Higher cholesterol strongly correlates with heart disease.
-- Higher resting blood pressure also correlates with heart disease.
-""")
-
-print("\n🎉 ANALYSIS COMPLETE!")
+from db import get_connection
+from cache import cached_load
+from cleaning import recode
+from footprint import report
+import plots
+
+# Columns analysed below
+NUMERIC_COLS = ['age', 'trestbps', 'chol', 'thalch', 'oldpeak', 'num']
+CATEGORICAL_COLS = ['sex', 'cp', 'fbs', 'restecg', 'exang', 'slope', 'ca', 'thal', 'dataset']
+
+
+# ============================================================
+# CLEANING + ANALYSIS STEPS (also timed by benchmarks/bench_pipeline.py)
+# ============================================================
+# Categorical columns arrive as pd.Categorical (schema.py): strip the labels
+# and turn missing / 'nan' into 'Unknown', once per category
+def clean_label(value):
+    value = str(value).strip()
+    return "Unknown" if value == "nan" else value
+
+
+def clean(df):
+    """Numeric columns coerced and median-filled, categorical labels cleaned."""
+    # Strip column names
+    df.columns = df.columns.str.strip()
+
+    # Convert numeric columns
+    for col in NUMERIC_COLS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    for col in CATEGORICAL_COLS:
+        df[col] = recode(df[col], clean_label, fill="Unknown")
+
+    # Fill missing numeric values with median
+    df[NUMERIC_COLS] = df[NUMERIC_COLS].fillna(df[NUMERIC_COLS].median())
+    return df
+
+
+def aggregate(df):
+    """Numeric correlations, and the mean disease score by sex and by age group."""
+    age_group = pd.cut(df['age'], bins=[29,39,49,59,69,79,89],
+                       labels=['30-39','40-49','50-59','60-69','70-79','80-89']).rename('age_group')
+    return {
+        "corr": df.corr(numeric_only=True),
+        "by_sex": df.groupby('sex')['num'].mean().reset_index(),
+        "by_age_group": df.groupby(age_group)['num'].mean().reset_index(),
+    }
+
+
+def main():
+    print("✔ Libraries loaded successfully!\n")
+
+    # ============================================================
+    # 2. CONNECT TO MYSQL AND LOAD DATA
+    # ============================================================
+    print("🔌 Connecting to MySQL...")
+
+    try:
+        conn = get_connection()
+        print("✔ Connected to MySQL database successfully!")
+    except Exception as e:
+        print("❌ ERROR: Could not connect to MySQL.")
+        print("Error message:", e)
+        exit(1)
+
+    # Load table q4_data (only the columns analysed below)
+    try:
+        df = cached_load(conn, "q4_data", NUMERIC_COLS + CATEGORICAL_COLS,
+                        {col: "float64" for col in NUMERIC_COLS})
+        print(f"\n📌 RAW DATA PREVIEW ({len(df)} rows):")
+        print(df.head())
+    except Exception as e:
+        print("❌ ERROR loading dataset from MySQL:")
+        print(e)
+        exit(1)
+
+    # ============================================================
+    # 3. CLEAN DATA
+    # ============================================================
+    print("\n🔧 Cleaning dataset...")
+
+    df = clean(df)
+
+    print("✔ Data cleaned successfully!")
+    report("q4_data after cleaning", df)
+    print()
+    print("📌 CLEANED DATA INFO:")
+    print(df.info())
+
+    # ============================================================
+    # 4. SUMMARY STATISTICS
+    # ============================================================
+    print("\n📊 SUMMARY STATISTICS:")
+    print(df.describe())
+
+    # ============================================================
+    # 5. CORRELATION ANALYSIS
+    # ============================================================
+    summary = aggregate(df)
+    corr_matrix = summary["corr"]
+
+    print("\n📌 CORRELATION WITH HEART DISEASE (num):")
+    print(corr_matrix['num'].sort_values(ascending=False))
+
+    # Charts render on background workers while the analysis continues; scatters
+    # past PLOT_MAX_POINTS patients are drawn as 2D histograms (plots.points)
+    charts = plots.Renderer()
+
+    # Heatmap for numeric correlations
+    charts.submit("q5_correlation_heatmap.png", plots.heatmap, corr_matrix, title="Correlation Heatmap",
+                  fmt=".2f", figsize=(10,8))
+
+    # ============================================================
+    # 6. AGE VS HEART DISEASE
+    # ============================================================
+    charts.submit("q5_age_vs_disease.png", *plots.points(df['age'], df['num']),
+                  title="Age vs Heart Disease Severity", xlabel="Age",
+                  ylabel="Heart Disease Score (num)", alpha=0.6, figsize=(8,5))
+
+    # ============================================================
+    # 7. GENDER ANALYSIS
+    # ============================================================
+    gender_result = summary["by_sex"]
+    print("\n📌 AVERAGE HEART DISEASE SCORE BY GENDER:")
+    print(gender_result)
+
+    charts.submit("q5_disease_by_sex.png", plots.bar, gender_result['sex'], gender_result['num'],
+                  title="Heart Disease Severity by Sex", xlabel="Sex (1 = Male, 0 = Female)",
+                  ylabel="Average Disease Severity", figsize=(7,4))
+
+    # ============================================================
+    # 8. CHOLESTEROL VS HEART DISEASE
+    # ============================================================
+    charts.submit("q5_chol_vs_disease.png", *plots.points(df['chol'], df['num']),
+                  title="Cholesterol vs Heart Disease Severity", xlabel="Cholesterol Level",
+                  ylabel="Heart Disease Score", alpha=0.6, color='orange', figsize=(8,5))
+
+    # ============================================================
+    # 9. BLOOD PRESSURE VS HEART DISEASE
+    # ============================================================
+    charts.submit("q5_bp_vs_disease.png", *plots.points(df['trestbps'], df['num']),
+                  title="Blood Pressure vs Heart Disease Severity",
+                  xlabel="Resting Blood Pressure (trestbps)", ylabel="Heart Disease Score",
+                  alpha=0.6, color='green', figsize=(8,5))
+
+    # ============================================================
+    # 10. AGE GROUP ANALYSIS
+    # ============================================================
+    age_group_result = summary["by_age_group"]
+
+    print("\n📌 AVERAGE HEART DISEASE SCORE BY AGE GROUP:")
+    print(age_group_result)
+
+    charts.submit("q5_disease_by_age_group.png", plots.bar, age_group_result['age_group'],
+                  age_group_result['num'], title="Heart Disease Severity by Age Group",
+                  xlabel="Age Group", ylabel="Average Heart Disease Score", palette="viridis",
+                  figsize=(8,5))
+
+    # ============================================================
+    # 11. FINAL INSIGHTS
+    # ============================================================
+    print("\n=======================")
+    print("📌 FINAL ANALYTICS SUMMARY")
+    print("=======================\n")
+
+    print("🔹 Strongest positive correlations with heart disease:")
+    print(corr_matrix['num'].sort_values(ascending=False).head())
+
+    print("\n🔹 Average disease severity by gender:")
+    print(gender_result)
+
+    print("\n🔹 Average disease severity by age group:")
+    print(age_group_result)
+
+    print("\n🔹 Key Insights:")
+    print("""
+    - Older individuals show higher heart disease levels.
+    - Males typically show higher severity than females.
+    - Higher cholesterol strongly correlates with heart disease.
+    - Higher resting blood pressure also correlates with heart disease.
+    """)
+
+    print("\n📊 CHARTS:")
+    charts.wait()
+
+    print("\n🎉 ANALYSIS COMPLETE!")
+
+
+if __name__ == "__main__":
+    main()
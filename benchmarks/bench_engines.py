@@ -0,0 +1,89 @@
+# ================================================
+# BENCHMARK: pandas vs DuckDB vs Polars for the Q1 / Q4 summaries
+# Checks every engine returns the pandas results, then times each
+# engine at increasing thread counts. Every (engine, threads) cell
+# runs in a fresh process because Polars fixes its pool at import.
+#
+#   python -m benchmarks.bench_engines --rows 5000000
+# ================================================
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+
+import pandas as pd
+
+from benchmarks.synthetic import make_crime, make_sales
+from engines import ENGINES, crime_summary, sales_summary
+
+
+def available_engines():
+    return [e for e in ENGINES if e == "pandas" or find_spec(e) is not None]
+
+
+def check_identical(rows):
+    sales, crime = make_sales(rows), make_crime(rows)
+    expected = sales_summary(sales), crime_summary(crime)
+    for engine in available_engines()[1:]:
+        got = sales_summary(sales, engine), crime_summary(crime, engine)
+        for want, have in zip(expected, got):
+            for name in want:
+                pd.testing.assert_frame_equal(want[name], have[name], obj=f"{engine}:{name}")
+    print("✓ all engines match the pandas results")
+
+
+def worker(engine, threads, rows, repeats):
+    """Runs inside the child process; prints the best wall time as JSON."""
+    sales, crime = make_sales(rows), make_crime(rows)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        sales_summary(sales, engine, threads)
+        crime_summary(crime, engine, threads)
+        best = min(best, time.perf_counter() - start)
+    print(json.dumps({"engine": engine, "threads": threads, "seconds": best}))
+
+
+def run_cell(engine, threads, rows, repeats):
+    env = dict(os.environ, POLARS_MAX_THREADS=str(threads))
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_engines", "--worker", engine,
+         "--threads", str(threads), "--rows", str(rows), "--repeats", str(repeats)],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pandas vs DuckDB vs Polars for the Q1 / Q4 summaries")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--worker")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.threads, args.rows, args.repeats)
+        return
+
+    check_identical(min(args.rows, 200_000))
+
+    cores = os.cpu_count() or 1
+    thread_counts = sorted({1, *[2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores], cores})
+
+    print(f"rows: {args.rows} (sales + crime summaries, best of {args.repeats})")
+    print(f"{'engine':8} {'threads':>7} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    for engine in available_engines():
+        for threads in ([1] if engine == "pandas" else thread_counts):
+            cell = run_cell(engine, threads, args.rows, args.repeats)
+            baseline = baseline or cell["seconds"]
+            print(f"{engine:8} {threads:>7} {cell['seconds']:>9.3f} {baseline / cell['seconds']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
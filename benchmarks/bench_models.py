@@ -0,0 +1,45 @@
+# ================================================
+# BENCHMARK: churn model backends (Q2_MODEL=rf vs hgb)
+# Same synthetic telco rows and 80/20 split as Q2.py; reports fit and
+# predict time plus test accuracy for each backend.
+#
+#   python -m benchmarks.bench_models --rows 1000000
+# ================================================
+
+import argparse
+import time
+
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from benchmarks.synthetic import make_telco
+from churn import MODELS, build_pipeline, default_model, target, training_threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="churn model backends (Q2_MODEL=rf vs hgb)")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = make_telco(args.rows)
+    X_train, X_test, y_train, y_test = train_test_split(
+        df, target(df), test_size=0.2, random_state=42
+    )
+
+    print(f"rows: {args.rows} (train {len(X_train)}, test {len(X_test)})")
+    print(f"{'model':6} {'fit s':>8} {'predict s':>10} {'accuracy':>9}")
+    for backend in MODELS:
+        model = build_pipeline(default_model(backend))
+        start = time.perf_counter()
+        with training_threads():
+            model.fit(X_train, y_train)
+        fit = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pred = model.predict(X_test)
+        predict = time.perf_counter() - start
+        print(f"{backend:6} {fit:>8.2f} {predict:>10.2f} {accuracy_score(y_test, pred):>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
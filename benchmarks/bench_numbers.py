@@ -0,0 +1,73 @@
+# ================================================
+# BENCHMARK: Q3 rating / money conversion
+# Original five-pass chain per column vs cleaning.parse_number
+#
+#   python -m benchmarks.bench_numbers --rows 500000
+# ================================================
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning import parse_number
+
+RATING_COLS = ["Rating", "DirectorsRating", "WritersRating", "TotalFollowers", "Revenue", "Budget"]
+
+
+def legacy_numeric(series):
+    """Q3.py's original conversion for one column."""
+    s = (
+        series
+        .astype(str)
+        .str.replace(",", "")
+        .str.replace("$", "")
+        .str.extract(r"(\d+\.?\d*)")
+    )
+    return pd.to_numeric(s[0], errors="coerce")
+
+
+def make_rating_frame(rows, seed=42, suffixes=False):
+    """IMDb-style raw values: '7.5', '$1,234,567', '12,345 votes', blanks."""
+    rng = np.random.default_rng(seed)
+    frame = {}
+    for col in RATING_COLS:
+        amount = rng.random(rows) * (10 if "Rating" in col else 5e8)
+        text = pd.Series([f"{x:,.1f}" for x in amount], dtype=object)
+        if col in ("Revenue", "Budget"):
+            text = "$" + text
+        if suffixes and col in ("Revenue", "Budget"):
+            pick = rng.random(rows) < 0.3
+            text[pick] = [f"${x / 1e6:.1f}M" for x in amount[pick]]
+        text[rng.random(rows) < 0.02] = None
+        frame[col] = text
+    return pd.DataFrame(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Q3 rating / money conversion")
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    df = make_rating_frame(args.rows)
+
+    start = time.perf_counter()
+    legacy = {col: legacy_numeric(df[col]) for col in RATING_COLS}
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = {col: parse_number(df[col]) for col in RATING_COLS}
+    parsed_s = time.perf_counter() - start
+
+    # Without K/M/B suffixes both must agree exactly
+    for col in RATING_COLS:
+        assert legacy[col].equals(parsed[col]), col
+
+    print(f"rows: {args.rows} x {len(RATING_COLS)} columns")
+    print(f"5-pass chain : {legacy_s:8.3f}s")
+    print(f"parse_number : {parsed_s:8.3f}s  ({legacy_s / parsed_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
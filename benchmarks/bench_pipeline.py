@@ -0,0 +1,290 @@
+# ================================================
+# BENCHMARK: load / clean / aggregate / train / plot for every table
+# Seeded raw tables from benchmarks.synthetic (messy values included) go
+# through the Q scripts' own functions:
+#
+#   load       row tuples -> loader.typed_frame chunks, combine_chunks
+#              (load_table minus the MySQL wire; tuples are built untimed)
+#   clean      the script's clean()
+#   aggregate  the script's aggregate() (--engine for q1_data / q5_data;
+#              Q2.py has none)
+#   train      Q2.split() + Q2.train() + predict (q2_data only)
+#   plot       the script's charts through plots.py
+#
+# Each (table, rows) cell runs in a fresh process so its peak RSS is its
+# own. Results are written as JSON; --baseline compares a run against an
+# earlier file and exits 1 when a stage got slower than --tolerance.
+#
+#   python -m benchmarks.bench_pipeline --output bench.json
+#   python -m benchmarks.bench_pipeline --rows 10000,1000000 --tables q1_data,q5_data \
+#       --baseline bench.json
+# ================================================
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+import plots
+import Q1
+import Q2
+import Q3
+import Q4
+import Q5
+from benchmarks.bench_train import peak_rss_mb
+from benchmarks.synthetic import RAW_TABLES
+from churn import COLUMNS as CHURN_COLUMNS
+from churn import DTYPES as CHURN_DTYPES
+from churn import TARGET
+from loader import DEFAULT_CHUNKSIZE, combine_chunks, typed_frame
+from schema import table_dtypes
+
+STAGES = ["load", "clean", "aggregate", "train", "plot"]
+
+
+# -----------------------
+# Charts (the scripts draw theirs inline in main())
+# -----------------------
+def plot_sales(df, summary, charts, out):
+    monthly = summary["monthly_trends"]
+    charts.submit(os.path.join(out, "trend_plot.png"), plots.line, monthly['Month'].astype(str),
+                  monthly['transactions'], title="Monthly Sales Trend", rotation=45, figsize=(10,5))
+
+
+def train_churn(df, model):
+    X_train, X_test, y_train, y_test = Q2.split(df)
+    pipeline = Q2.train(X_train, y_train, model)
+    return accuracy_score(y_test, pipeline.predict(X_test))
+
+
+def plot_churn(df, summary, charts, out):
+    # All.py's churn chart: Q2.py's own chart needs importances of the trained model
+    counts = df[TARGET].value_counts().sort_index()
+    charts.submit(os.path.join(out, "q2_churn_distribution.png"), plots.bar, counts.index,
+                  counts.to_numpy(), title="Customer Churn Distribution", figsize=(6,4))
+
+
+def plot_movies(df, summary, charts, out):
+    by_year = summary["rating_by_year"]
+    charts.submit(os.path.join(out, "q3_rating_distribution.png"), plots.hist,
+                  df["Rating"].dropna().to_numpy(), bins=20, figsize=(8,5))
+    charts.submit(os.path.join(out, "q3_correlation_matrix.png"), plots.matrix, summary["corr"],
+                  figsize=(6,4))
+    charts.submit(os.path.join(out, "q3_rating_by_year.png"), plots.line, by_year["Year"],
+                  by_year["Rating"], grid=True, figsize=(10,5))
+
+
+def plot_heart(df, summary, charts, out):
+    charts.submit(os.path.join(out, "q5_correlation_heatmap.png"), plots.heatmap, summary["corr"],
+                  fmt=".2f", figsize=(10,8))
+    for col in ['age', 'chol', 'trestbps']:
+        charts.submit(os.path.join(out, f"q5_{col}_vs_disease.png"), *plots.points(df[col], df['num']),
+                      alpha=0.6, figsize=(8,5))
+    for name in ["by_sex", "by_age_group"]:
+        frame = summary[name]
+        charts.submit(os.path.join(out, f"q5_disease_{name}.png"), plots.bar, frame.iloc[:, 0],
+                      frame['num'].to_numpy(), figsize=(8,5))
+
+
+def plot_crime(df, summary, charts, out):
+    top10 = summary["top_areas"].head(10)
+    monthly, daily = summary["monthly_crime"], summary["daily_crime"]
+    charts.submit(os.path.join(out, "q4_top_areas.png"), plots.bar, top10["AREA_NAME_alias"],
+                  top10["Incidents"], rotation=45, ha="right", figsize=(10,6))
+    charts.submit(os.path.join(out, "q4_monthly_trend.png"), plots.line, monthly["Month"].astype(str),
+                  monthly["Incidents"], marker="o", rotation=45, ha="right", figsize=(10,6))
+    days, counts = plots.downsample(daily["Day"], daily["Incidents"])
+    charts.submit(os.path.join(out, "q5_daily_trend.png"), plots.line, days, counts, rotation=45,
+                  figsize=(12,5))
+
+
+# Per table: the columns its script loads, their load dtypes, and the stages;
+# "engine" marks aggregates that take the --engine argument
+PIPELINES = {
+    "q1_data": {
+        "columns": Q1.COLUMNS,
+        "dtypes": Q1.DTYPES,
+        "clean": Q1.clean, "aggregate": Q1.aggregate, "engine": True, "plot": plot_sales,
+    },
+    "q2_data": {
+        "columns": CHURN_COLUMNS,
+        "dtypes": CHURN_DTYPES,
+        "clean": Q2.clean, "train": train_churn, "plot": plot_churn,
+    },
+    "q3_data": {
+        "columns": Q3.COLUMNS,
+        "dtypes": None,
+        "clean": Q3.clean, "aggregate": Q3.aggregate, "plot": plot_movies,
+    },
+    "q4_data": {
+        "columns": Q5.NUMERIC_COLS + Q5.CATEGORICAL_COLS,
+        "dtypes": {col: "float64" for col in Q5.NUMERIC_COLS},
+        "clean": Q5.clean, "aggregate": Q5.aggregate, "plot": plot_heart,
+    },
+    "q5_data": {
+        # What Q4.py resolves against q5_data (its date fallback is Date_Rptd)
+        "columns": ["Date_Rptd", "DATE_OCC", "TIME_OCC", "AREA_NAME", "Crm_Cd_Desc", "LAT", "LON"],
+        "dtypes": None,
+        "clean": Q4.clean, "aggregate": Q4.aggregate, "engine": True, "plot": plot_crime,
+    },
+}
+
+
+def load(raw, table, columns, dtypes, chunksize=DEFAULT_CHUNKSIZE):
+    """load_table after the wire: (frame, seconds). Only the typing, concat and downcast are timed."""
+    dtypes = table_dtypes(table, columns, dtypes)
+    projected = raw[columns]
+    chunks, seconds = [], 0.0
+    for start in range(0, len(projected), chunksize):
+        rows = list(projected.iloc[start:start + chunksize].itertuples(index=False, name=None))
+        tick = time.perf_counter()
+        chunks.append(typed_frame(rows, columns, dtypes))
+        seconds += time.perf_counter() - tick
+    tick = time.perf_counter()
+    df = combine_chunks(chunks, table)
+    return df, seconds + time.perf_counter() - tick
+
+
+def worker(table, rows, engine, model):
+    """Runs inside the child process; prints one JSON line with every stage's time."""
+    spec = PIPELINES[table]
+    raw = RAW_TABLES[table](rows)
+    timings = {}
+
+    df, timings["load"] = load(raw, table, spec["columns"], spec["dtypes"])
+    del raw
+
+    tick = time.perf_counter()
+    df = spec["clean"](df)
+    timings["clean"] = time.perf_counter() - tick
+
+    summary = None
+    if "aggregate" in spec:
+        tick = time.perf_counter()
+        summary = spec["aggregate"](df, engine) if spec.get("engine") else spec["aggregate"](df)
+        timings["aggregate"] = time.perf_counter() - tick
+
+    if "train" in spec:
+        tick = time.perf_counter()
+        spec["train"](df, model)
+        timings["train"] = time.perf_counter() - tick
+
+    with tempfile.TemporaryDirectory() as out:
+        tick = time.perf_counter()
+        charts = plots.Renderer()
+        spec["plot"](df, summary, charts, out)
+        charts.wait()
+        timings["plot"] = time.perf_counter() - tick
+
+    print(json.dumps({"table": table, "rows": rows, "stages": timings, "peak_mb": peak_rss_mb()}))
+
+
+def run_cell(table, rows, engine, model):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pipeline", "--worker", "--tables", table,
+         "--rows", str(rows), "--engine", engine, "--model", model],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True,
+                             capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, tolerance, min_seconds):
+    """
+    Print each stage against the baseline run; returns how many got slower
+    than `tolerance`. Stages under `min_seconds` in both runs are timer
+    noise and never count.
+    """
+    with open(baseline_path) as fh:
+        baseline = {(r["table"], r["rows"], r["stage"]): r["seconds"] for r in json.load(fh)["results"]}
+    regressions = 0
+    print(f"\nvs {baseline_path} (tolerance {tolerance:.0%}):")
+    for r in results:
+        before = baseline.get((r["table"], r["rows"], r["stage"]))
+        if before is None or before <= 0:
+            continue
+        ratio = r["seconds"] / before
+        slower = ratio > 1 + tolerance and max(before, r["seconds"]) >= min_seconds
+        regressions += slower
+        mark = "⚠" if slower else "✓"
+        print(f"{mark} {r['table']:8} {r['rows']:>10} {r['stage']:9} {before:>8.3f}s -> "
+              f"{r['seconds']:>8.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="load / clean / aggregate / train / plot for every table")
+    parser.add_argument("--rows", default="10000,1000000,10000000",
+                        help="comma-separated row counts")
+    parser.add_argument("--tables", default=",".join(PIPELINES),
+                        help="comma-separated tables")
+    parser.add_argument("--engine", default="pandas", help="aggregation engine for q1_data / q5_data")
+    parser.add_argument("--model", default="hgb", help="churn backend for the train stage")
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs the baseline (0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="stages faster than this in both runs are not compared")
+    parser.add_argument("--worker", action="store_true")
+    args = parser.parse_args()
+
+    tables = args.tables.split(",")
+    sizes = [int(n) for n in args.rows.split(",")]
+    if args.worker:
+        worker(tables[0], sizes[0], args.engine, args.model)
+        return
+
+    print(f"{'table':8} {'rows':>10} " + " ".join(f"{s:>9}" for s in STAGES) + f" {'peak MB':>8}")
+    results = []
+    for rows in sizes:
+        for table in tables:
+            cell = run_cell(table, rows, args.engine, args.model)
+            stages = cell["stages"]
+            print(f"{table:8} {rows:>10} "
+                  + " ".join(f"{stages[s]:>9.3f}" if s in stages else f"{'-':>9}" for s in STAGES)
+                  + f" {cell['peak_mb']:>8.0f}")
+            results += [{"table": table, "rows": rows, "stage": stage, "seconds": seconds,
+                         "rows_per_s": rows / seconds if seconds else None, "peak_mb": cell["peak_mb"]}
+                        for stage, seconds in stages.items()]
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "cpus": os.cpu_count(),
+            "engine": args.engine,
+            "model": args.model,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance, args.min_seconds):
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
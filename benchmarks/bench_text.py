@@ -0,0 +1,71 @@
+# ================================================
+# BENCHMARK: Q3 text normalization
+# Original per-row clean_text (.apply) vs vectorized cleaning.normalize_text
+#
+#   python -m benchmarks.bench_text --rows 200000
+# ================================================
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning import TEXT_DTYPE, normalize_text
+
+TEXT_COLS = ["Movie_Name", "Scraped_Name", "Director", "Writer", "Actor", "OtherInfo"]
+
+
+def clean_text(x):
+    """Q3.py's original per-row cleaner, kept verbatim as the reference."""
+    if pd.isna(x): return ""
+    x = str(x)
+    x = re.sub(r'[\n\r\t]', ' ', x)
+    x = re.sub(r'\s+', ' ', x)
+    return x.strip()
+
+
+def make_text_frame(rows, seed=42):
+    """Scraped-looking text: padded names, embedded newlines/tabs and gaps."""
+    rng = np.random.default_rng(seed)
+    words = np.array(["The", "Dark", "Night", "Drama", "Action", "Sci-Fi", "Smith", "Lee"])
+    seps = np.array([" ", "  ", "\n", "\t", " \r\n "])
+    frame = {}
+    for col in TEXT_COLS:
+        a, b, c = (rng.choice(words, rows) for _ in range(3))
+        s1, s2 = rng.choice(seps, rows), rng.choice(seps, rows)
+        values = pd.Series(" " + a + s1 + b + s2 + c + "\n", dtype=object)
+        values[rng.random(rows) < 0.02] = None
+        frame[col] = values
+    return pd.DataFrame(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Q3 text normalization")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = make_text_frame(args.rows)
+
+    start = time.perf_counter()
+    legacy = df.copy()
+    for col in TEXT_COLS:
+        legacy[col] = legacy[col].apply(clean_text)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = normalize_text(df.copy(), TEXT_COLS)
+    vector_s = time.perf_counter() - start
+
+    for col in TEXT_COLS:
+        assert (vectorized[col].astype(object) == legacy[col]).all(), col
+
+    print(f"rows: {args.rows} x {len(TEXT_COLS)} columns ({TEXT_DTYPE})")
+    print(f"clean_text (.apply): {legacy_s:8.3f}s  {legacy.memory_usage(deep=True).sum() / 1e6:8.1f} MB")
+    print(f"normalize_text     : {vector_s:8.3f}s  {vectorized.memory_usage(deep=True).sum() / 1e6:8.1f} MB"
+          f"  ({legacy_s / vector_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# ================================================
+# BENCHMARK: TIME_OCC parsing
+# Original per-row fix_time (.apply) vs vectorized cleaning.parse_hhmm
+#
+#   python -m benchmarks.bench_time_occ --rows 1000000
+# ================================================
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning import parse_hhmm
+
+
+def fix_time(x):
+    """Q4.py's original per-row parser, kept verbatim as the reference."""
+    if pd.isna(x):
+        return None
+    s = str(x).strip()
+    s_digits = re.sub(r"\D", "", s)
+    if s_digits == "":
+        return None
+    s_digits = s_digits.zfill(4)
+    try:
+        t = pd.to_datetime(s_digits, format="%H%M", errors="coerce").time()
+        return t
+    except Exception:
+        return None
+
+
+def make_time_occ(rows, seed=42):
+    """TIME_OCC-like values: mostly HHMM without padding, plus the messy cases."""
+    rng = np.random.default_rng(seed)
+    clock = (rng.integers(0, 24, rows) * 100 + rng.integers(0, 60, rows)).astype(str)
+    messy = np.array(["1", "635", "1110", "12:30", "abc", "", "2400", "0960", "12345"], dtype=object)
+    values = clock.astype(object)
+    pick = rng.random(rows) < 0.05
+    values[pick] = rng.choice(messy, pick.sum())
+    values[rng.random(rows) < 0.01] = None
+    return pd.Series(values)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TIME_OCC parsing")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    values = make_time_occ(args.rows)
+
+    legacy, legacy_s = timed(lambda v: v.apply(fix_time), values)
+    vectorized, vector_s = timed(parse_hhmm, values)
+
+    expected = legacy.map(lambda t: t.hour * 60 + t.minute if t is not None else None)
+    expected = expected.astype("Int16")
+    assert expected.equals(vectorized), "vectorized parser disagrees with fix_time"
+
+    print(f"rows: {args.rows}")
+    print(f"fix_time (.apply): {legacy_s:8.3f}s")
+    print(f"parse_hhmm       : {vector_s:8.3f}s  ({legacy_s / vector_s:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
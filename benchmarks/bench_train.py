@@ -0,0 +1,98 @@
+# ================================================
+# BENCHMARK: Q2 random forest training throughput
+# Fits the full churn pipeline on synthetic telco rows for every
+# (n_estimators, max_samples) cell and reports fit time, trees/s and
+# peak resident memory. Each cell runs in a fresh process so its peak
+# RSS is its own.
+#
+#   python -m benchmarks.bench_train --rows 500000 --n-jobs -1
+# ================================================
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_telco
+from churn import build_pipeline, forest, target
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+def parse_max_samples(value):
+    return None if value == "all" else float(value)
+
+
+def check_deterministic(rows):
+    """Same random_state -> same model on 1 core and on all cores."""
+    df = make_telco(rows)
+    probas = [
+        build_pipeline(forest(n_estimators=20, n_jobs=n_jobs)).fit(df, target(df)).predict_proba(df)
+        for n_jobs in (1, -1)
+    ]
+    assert np.array_equal(*probas), "n_jobs changed the fitted forest"
+    print("✓ n_jobs=1 and n_jobs=-1 fit identical forests")
+
+
+def worker(rows, trees, max_samples, n_jobs):
+    """Runs inside the child process; prints one JSON result line."""
+    df = make_telco(rows)
+    y = target(df)
+    before = peak_rss_mb()
+    model = build_pipeline(forest(n_estimators=trees, max_samples=max_samples, n_jobs=n_jobs))
+    start = time.perf_counter()
+    model.fit(df, y)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "trees": trees, "max_samples": max_samples, "seconds": seconds,
+        "trees_per_s": trees / seconds, "peak_mb": peak_rss_mb(), "data_mb": before,
+    }))
+
+
+def run_cell(rows, trees, max_samples, n_jobs):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_train", "--worker", "--rows", str(rows),
+         "--trees", str(trees), "--max-samples", str(max_samples or "all"), "--n-jobs", str(n_jobs)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Q2 random forest training throughput")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--trees", default="50,100,250",
+                        help="comma-separated n_estimators values")
+    parser.add_argument("--max-samples", default="all,0.5,0.1",
+                        help="comma-separated max_samples values ('all' = bootstrap every row)")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--worker", action="store_true")
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.rows, int(args.trees), parse_max_samples(args.max_samples), args.n_jobs)
+        return
+
+    check_deterministic(min(args.rows, 5_000))
+
+    print(f"rows: {args.rows}, n_jobs: {args.n_jobs} ({os.cpu_count()} cores)")
+    print(f"{'trees':>6} {'max_samples':>11} {'seconds':>9} {'trees/s':>8} {'peak MB':>8} {'fit MB':>7}")
+    for trees in map(int, args.trees.split(",")):
+        for max_samples in map(parse_max_samples, args.max_samples.split(",")):
+            cell = run_cell(args.rows, trees, max_samples, args.n_jobs)
+            print(f"{trees:>6} {str(max_samples or 'all'):>11} {cell['seconds']:>9.2f} "
+                  f"{cell['trees_per_s']:>8.1f} {cell['peak_mb']:>8.0f} "
+                  f"{cell['peak_mb'] - cell['data_mb']:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# ================================================
+# SEEDED SYNTHETIC TABLES FOR THE BENCHMARKS
+# Same columns and value shapes as the qN_data tables, so benchmarks
+# can run at any size without a database.
+#
+# make_telco() returns q2_data as loaded (typed); make_sales() and
+# make_crime() return the cleaned columns the engines.py summaries read.
+# The raw_* generators return each table as MySQL hands it over -- text
+# where the table stores text, with the messy values the cleaners deal
+# with (blank and invalid dates, padded labels, "$1.2M" money, HHMM times
+# without padding, ...).
+# Text is drawn from pre-formatted pools, so 10M rows build in seconds.
+# ================================================
+
+import numpy as np
+import pandas as pd
+
+from churn import CATEGORICAL, TARGET
+
+YES_NO = ["No", "Yes"]
+SERVICE = ["No", "No internet service", "Yes"]
+
+TELCO_CHOICES = {
+    "gender": ["Female", "Male"],
+    "Partner": YES_NO,
+    "Dependents": YES_NO,
+    "PhoneService": YES_NO,
+    "MultipleLines": ["No", "No phone service", "Yes"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": SERVICE,
+    "OnlineBackup": SERVICE,
+    "DeviceProtection": SERVICE,
+    "TechSupport": SERVICE,
+    "StreamingTV": SERVICE,
+    "StreamingMovies": SERVICE,
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": YES_NO,
+    "PaymentMethod": [
+        "Bank transfer (automatic)", "Credit card (automatic)",
+        "Electronic check", "Mailed check",
+    ],
+}
+
+
+def make_telco(rows, seed=42):
+    """
+    q2_data as loaded: categorical service columns, float charges, a few
+    blank TotalCharges, and a Churn label that depends on contract,
+    tenure and charges so models have something to learn.
+    """
+    rng = np.random.default_rng(seed)
+    frame = {
+        col: pd.Categorical.from_codes(rng.integers(0, len(TELCO_CHOICES[col]), rows),
+                                       categories=TELCO_CHOICES[col])
+        for col in CATEGORICAL
+    }
+    tenure = rng.integers(0, 73, rows).astype(np.float64)
+    monthly = np.round(rng.uniform(18, 120, rows), 2)
+    total = np.round(monthly * tenure, 2)
+    total[rng.random(rows) < 0.002] = np.nan
+
+    month_to_month = frame["Contract"] == "Month-to-month"
+    logit = -1.2 + 1.5 * month_to_month - 0.035 * tenure + 0.012 * monthly
+    churn = rng.random(rows) < 1 / (1 + np.exp(-logit))
+
+    frame.update({
+        "SeniorCitizen": (rng.random(rows) < 0.16).astype(np.float64),
+        "tenure": tenure,
+        "MonthlyCharges": monthly,
+        "TotalCharges": total,
+        TARGET: pd.Categorical.from_codes(churn.astype(np.int8), categories=YES_NO),
+    })
+    return pd.DataFrame(frame)
+
+
+def make_sales(rows, seed=42):
+    """q1_data after Q1.clean: the columns sales_summary groups on."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Order_Date": pd.Timestamp("2014-01-01") + pd.to_timedelta(rng.integers(0, 4 * 365, rows), unit="D"),
+        "Region": rng.choice(["Central", "East", "South", "West"], rows),
+        "Product_Name": rng.choice([f"Product {i}" for i in range(1800)], rows),
+    })
+
+
+def make_crime(rows, seed=42):
+    """q5_data after Q4.clean: the columns crime_summary groups on."""
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 5 * 365 * 86400, rows)
+    return pd.DataFrame({
+        "DATE_OCC": pd.Timestamp("2020-01-01") + pd.to_timedelta(seconds, unit="s"),
+        "AREA_NAME_alias": rng.choice([f"Area {i}" for i in range(21)], rows),
+        "Crm_Cd_Desc_alias": rng.choice([f"Crime {i}" for i in range(140)], rows),
+    })
+
+
+# -----------------------
+# Raw tables (as stored in MySQL)
+# -----------------------
+def _pick(rng, pool, rows, missing=0.0):
+    """rows draws from `pool` (an object array), with a `missing` share of None."""
+    values = np.asarray(pool, dtype=object)[rng.integers(0, len(pool), rows)]
+    if missing:
+        values[rng.random(rows) < missing] = None
+    return values
+
+
+def _mess(rng, values, junk, share):
+    """Replace a `share` of `values` with draws from `junk`."""
+    hit = rng.random(len(values)) < share
+    values[hit] = np.asarray(junk, dtype=object)[rng.integers(0, len(junk), hit.sum())]
+    return values
+
+
+def _dates(start, days, fmt):
+    return pd.date_range(start, periods=days, freq="D").strftime(fmt).to_numpy(dtype=object)
+
+
+def raw_superstore(rows, seed=42):
+    """q1_data: m/d/Y order and ship dates (some blank or invalid), gaps in Region, mixed-case Category."""
+    rng = np.random.default_rng(seed)
+    days = _dates("2014-01-01", 4 * 365, "%m/%d/%Y")
+    return pd.DataFrame({
+        "Row_ID": np.arange(1, rows + 1),
+        "Order_Date": _mess(rng, _pick(rng, days, rows), ["", "N/A", "13/45/2016"], 0.01),
+        "Ship_Date": _mess(rng, _pick(rng, days, rows), [""], 0.01),
+        "Postal_Code": _mess(rng, _pick(rng, [str(z) for z in range(10001, 10501)], rows), [None, ""], 0.01),
+        "Region": _pick(rng, ["Central", "East", "South", "West"], rows, missing=0.01),
+        "Category": _pick(rng, ["Furniture", "office supplies", "Office Supplies", "TECHNOLOGY", "Technology"],
+                          rows, missing=0.01),
+        "Product_Name": _pick(rng, [f"Product {i}" for i in range(1800)], rows),
+    })
+
+
+def raw_telco(rows, seed=42):
+    """q2_data: customerID, Yes/No text columns, and TotalCharges as text with blank entries."""
+    df = make_telco(rows, seed)
+    for col in CATEGORICAL + [TARGET]:
+        df[col] = df[col].astype(object)
+    total = df["TotalCharges"].map("{:.2f}".format).to_numpy(dtype=object)
+    total[df["TotalCharges"].isna().to_numpy()] = " "
+    df["TotalCharges"] = total
+    df["SeniorCitizen"] = df["SeniorCitizen"].astype(np.int64)
+    df["tenure"] = df["tenure"].astype(np.int64)
+    df.insert(0, "customerID", pd.RangeIndex(rows).astype(str) + "-SYNTH")
+    return df
+
+
+def raw_imdb(rows, seed=42):
+    """q3_data: padded / multi-line text, ratings as text, '$1.2M'-style money, dates in several layouts."""
+    rng = np.random.default_rng(seed)
+    words = ["The", "Dark", "Night", "Last", "Red", "City", "Lost", "Star", "Road", "Home"]
+    seps = [" ", "  ", "\n", "\t", " \r\n "]
+    names = [f" {a}{s}{b} {i % 97}\n" for i, (a, s, b) in
+             enumerate(zip(rng.choice(words, 5000), rng.choice(seps, 5000), rng.choice(words, 5000)))]
+    people = [f"{a}{s}{b}" for a, s, b in
+              zip(rng.choice(words, 500), rng.choice(seps, 500), rng.choice(words, 500))]
+    genres = ["Action", "Drama", "Comedy", "Thriller", "Horror", "Sci-Fi", "Romance", "Crime"]
+    info = [f"{y} | {a}, {b} | {m} min" for y, a, b, m in
+            zip(rng.integers(1950, 2024, 2000), rng.choice(genres, 2000),
+                rng.choice(genres + ["Documentary", ""], 2000), rng.integers(80, 200, 2000))]
+    scores = [f"{x / 10:.1f}" for x in range(10, 101)]
+    money = ([f"${x:,}" for x in rng.integers(10_000, 900_000_000, 3000)]
+             + [f"${x / 10:.1f}M" for x in range(1, 3000)] + ["$450K", "3 Billion", "N/A", ""])
+    dates = ([f"{y}-{m:02d}-{d:02d}" for y, m, d in
+              zip(rng.integers(1950, 2024, 1500), rng.integers(1, 13, 1500), rng.integers(1, 29, 1500))]
+             + [f"({y})" for y in range(1950, 2024)] + ["Released May 2010", "TBA"])
+    return pd.DataFrame({
+        "Movie_Name": _pick(rng, names, rows),
+        "Scraped_Name": _pick(rng, names, rows, missing=0.02),
+        "Director": _pick(rng, people, rows, missing=0.02),
+        "Writer": _pick(rng, people, rows, missing=0.02),
+        "Actor": _pick(rng, people, rows, missing=0.02),
+        "OtherInfo": _pick(rng, info, rows, missing=0.02),
+        "Rating": _mess(rng, _pick(rng, scores, rows), ["7.5/10", "N/A", ""], 0.02),
+        "DirectorsRating": _pick(rng, scores, rows, missing=0.02),
+        "WritersRating": _pick(rng, scores, rows, missing=0.02),
+        "TotalFollowers": _pick(rng, [f"{x:,}" for x in rng.integers(0, 5_000_000, 3000)], rows),
+        "Revenue": _pick(rng, money, rows, missing=0.05),
+        "Budget": _pick(rng, money, rows, missing=0.05),
+        "Date": _pick(rng, dates, rows, missing=0.01),
+    })
+
+
+def raw_heart(rows, seed=42):
+    """q4_data (UCI heart disease): numeric vitals with gaps, text categoricals with blanks / 'nan'."""
+    rng = np.random.default_rng(seed)
+    age = rng.integers(29, 78, rows)
+    chol = rng.normal(240, 50, rows).round().clip(0, 600)
+    chol[rng.random(rows) < 0.03] = 0  # the UCI data records missing cholesterol as 0
+    trestbps = rng.normal(132, 18, rows).round().clip(80, 200)
+    trestbps[rng.random(rows) < 0.02] = np.nan
+    num = np.clip(((age - 29) / 12 + rng.normal(0, 1, rows)).round(), 0, 4).astype(np.int64)
+    return pd.DataFrame({
+        "id": np.arange(1, rows + 1),
+        "age": age,
+        "sex": _pick(rng, ["Male", "Female"], rows),
+        "dataset": _pick(rng, ["Cleveland", "Hungary", "Switzerland", "VA Long Beach"], rows),
+        "cp": _pick(rng, ["typical angina", "atypical angina", "non-anginal", "asymptomatic"], rows),
+        "trestbps": trestbps,
+        "chol": chol,
+        "fbs": _pick(rng, ["TRUE", "FALSE", " FALSE", "nan"], rows, missing=0.05),
+        "restecg": _pick(rng, ["normal", "lv hypertrophy", "st-t abnormality"], rows, missing=0.01),
+        "thalch": rng.normal(137, 25, rows).round(),
+        "exang": _pick(rng, ["TRUE", "FALSE"], rows, missing=0.05),
+        "oldpeak": _mess(rng, rng.uniform(0, 6, rows).round(1).astype(object), [None], 0.05),
+        "slope": _pick(rng, ["upsloping", "flat", "downsloping"], rows, missing=0.3),
+        "ca": _pick(rng, ["0.0", "1.0", "2.0", "3.0"], rows, missing=0.6),
+        "thal": _pick(rng, ["normal", "fixed defect", "reversable defect"], rows, missing=0.5),
+        "num": num,
+    })
+
+
+def raw_crime(rows, seed=42):
+    """
+    q5_data (LA crime): 'MM/DD/YYYY 12:00:00 AM' dates with blanks and junk,
+    TIME_OCC as unpadded HHMM text ('1', '635', '1110', 'abc'), padded area
+    names, addresses in LOCATION (a few with explicit lat/lon pairs).
+    """
+    rng = np.random.default_rng(seed)
+    days = _dates("2020-01-01", 5 * 365, "%m/%d/%Y 12:00:00 AM")
+    clock = [str(h * 100 + m) for h in range(24) for m in range(60)]
+    areas = ["Central", "Rampart", "Southwest", "Hollenbeck", "Harbor", "Hollywood", "Wilshire",
+             "West LA", "Van Nuys", "West Valley", "Northeast", "77th Street", "Newton", "Pacific",
+             "N Hollywood", "Foothill", "Devonshire", "Southeast", "Mission", "Olympic", "Topanga"]
+    crimes = [f"CRIME TYPE {i:03d}" for i in range(140)]
+    streets = [f"{n} {s} ST" for n, s in zip(rng.integers(100, 20000, 3000), rng.choice(list("ABCDEFGH"), 3000))]
+    lat, lon = rng.uniform(33.7, 34.3, rows).round(4), rng.uniform(-118.7, -118.1, rows).round(4)
+    return pd.DataFrame({
+        "DR_NO": np.arange(200_000_000, 200_000_000 + rows),
+        "Date_Rptd": _mess(rng, _pick(rng, days, rows), [""], 0.01),
+        "DATE_OCC": _mess(rng, _pick(rng, days, rows), ["", "unknown"], 0.01),
+        "TIME_OCC": _mess(rng, _pick(rng, clock, rows), ["1", "635", "12:30", "abc", "", "2400", "12345"], 0.05),
+        "AREA_NAME": _pick(rng, areas + [f" {a} " for a in areas[:5]], rows, missing=0.005),
+        "Crm_Cd_Desc": _pick(rng, crimes, rows, missing=0.005),
+        "LOCATION": _mess(rng, _pick(rng, streets, rows), ["(34.0522, -118.2437)", "34.1, -118.3"], 0.02),
+        "LAT": lat,
+        "LON": lon,
+    })
+
+
+RAW_TABLES = {
+    "q1_data": raw_superstore,
+    "q2_data": raw_telco,
+    "q3_data": raw_imdb,
+    "q4_data": raw_heart,
+    "q5_data": raw_crime,
+}
@@ -0,0 +1,153 @@
+# ================================================
+# LOCAL COLUMNAR CACHE OF THE RAW qN_data TABLES
+# Snapshots each projected table to an uncompressed Feather (Arrow IPC)
+# file under CACHE_DIR and serves later loads from a memory map until
+# the MySQL table changes.
+#
+# Staleness is detected from information_schema CREATE_TIME/UPDATE_TIME.
+# UPDATE_TIME only has one-second resolution, so each snapshot records the
+# server time it was taken at, and the server-side CHECKSUM TABLE is added
+# whenever UPDATE_TIME is at or after that time (a write in the same second
+# would not move it) or unavailable (InnoDB before its first write since
+# restart). Either way no table data crosses the network to decide whether
+# the cache is fresh.
+#
+# Set DA_CACHE=0 to bypass the cache; pyarrow is required to use it.
+# ================================================
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import footprint
+from loader import DEFAULT_CHUNKSIZE, load_table, quote_ident
+from schema import table_dtypes
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # cache is optional
+    feather = None
+
+CACHE_DIR = os.environ.get("DA_CACHE_DIR", ".cache")
+ENABLED = os.environ.get("DA_CACHE", "1") != "0"
+
+
+def table_fingerprint(conn, table, since=None):
+    """
+    Cheap server-side signature of `table` that changes whenever its rows
+    do, and the server time it was taken at. The checksum is included when
+    UPDATE_TIME is at or after `since` (default: now), the time the
+    snapshot being checked was taken.
+    """
+    cur = conn.cursor()
+    try:
+        # MySQL 8 caches information_schema statistics for a day by default
+        try:
+            cur.execute("SET SESSION information_schema_stats_expiry = 0")
+        except Exception:
+            pass
+        cur.execute("SELECT NOW()")
+        now = cur.fetchone()[0]
+        cur.execute(
+            "SELECT CREATE_TIME, UPDATE_TIME FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,),
+        )
+        row = cur.fetchone()
+        create_time, update_time = row if row else (None, None)
+        fingerprint = {"create_time": str(create_time), "update_time": str(update_time)}
+        if update_time is None or update_time >= (since or now):
+            cur.execute(f"CHECKSUM TABLE {quote_ident(table)}")
+            fingerprint["checksum"] = cur.fetchone()[1]
+        return fingerprint, now
+    finally:
+        cur.close()
+
+
+def cache_path(table, columns=None, dtypes=None):
+    """Feather path for one projection of `table`; different column sets get different files."""
+    # repr keeps declared category lists in the key, so editing them re-snapshots;
+    # downcast and as-loaded snapshots are kept apart too, as are snapshots
+    # downcast under older rules
+    downcast = footprint.RULES_VERSION if footprint.ENABLED else False
+    spec = json.dumps([columns, dtypes, downcast], sort_keys=True, default=repr)
+    digest = hashlib.sha1(spec.encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{table}-{digest}.feather")
+
+
+def _read_meta(path):
+    try:
+        with open(path + ".json") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _snapshot_time(meta):
+    """Server time the snapshot described by `meta` was taken at, if recorded."""
+    try:
+        return datetime.fromisoformat(meta["snapshot_time"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def _write(df, path, fingerprint, snapshot_time):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Uncompressed so later reads can memory-map the file
+    feather.write_feather(df, path + ".tmp", compression="uncompressed")
+    os.replace(path + ".tmp", path)
+    with open(path + ".json.tmp", "w") as fh:
+        json.dump({"fingerprint": fingerprint, "snapshot_time": str(snapshot_time)}, fh)
+    os.replace(path + ".json.tmp", path + ".json")
+
+
+def _is_fresh(meta, fingerprint, path):
+    return bool(meta) and meta.get("fingerprint") == fingerprint and os.path.exists(path)
+
+
+def iter_cached(conn, table, columns=None, dtypes=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Yield the snapshot cached_load wrote for this projection in DataFrames
+    of at most `chunksize` rows, read from the memory map. Raises when
+    there is no snapshot or the table has changed since it was taken.
+    """
+    if feather is None:
+        raise ImportError("pyarrow is required to read the cache")
+    dtypes = table_dtypes(table, columns, dtypes)
+    path = cache_path(table, columns, dtypes)
+    meta = _read_meta(path)
+    fingerprint, _ = table_fingerprint(conn, table, _snapshot_time(meta))
+    if not _is_fresh(meta, fingerprint, path):
+        raise FileNotFoundError(f"no up-to-date snapshot of '{table}' at {path}; "
+                                "load it once with the cache enabled first")
+    for batch in feather.read_table(path, memory_map=True).to_batches(max_chunksize=chunksize):
+        yield batch.to_pandas()
+
+
+def cached_load(conn, table, columns=None, dtypes=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Drop-in for loader.load_table: return the cached snapshot when the table
+    is unchanged, otherwise reload it from MySQL and refresh the snapshot.
+    """
+    if not ENABLED or feather is None:
+        return load_table(conn, table, columns, dtypes, chunksize=chunksize)
+
+    dtypes = table_dtypes(table, columns, dtypes)
+    path = cache_path(table, columns, dtypes)
+    meta = _read_meta(path)
+    since = _snapshot_time(meta)
+    fingerprint, now = table_fingerprint(conn, table, since)
+
+    if _is_fresh(meta, fingerprint, path):
+        df = feather.read_table(path, memory_map=True).to_pandas()
+        print(f"✓ {table}: served {len(df)} rows from cache ({path})")
+        footprint.report(table, df)
+        return df
+
+    if since is not None:
+        # Checked against the old snapshot's time; the new one is taken now
+        fingerprint, now = table_fingerprint(conn, table)
+    df = load_table(conn, table, columns, dtypes, chunksize=chunksize)
+    _write(df, path, fingerprint, now)
+    return df
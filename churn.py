@@ -0,0 +1,265 @@
+# ================================================
+# Q2 CHURN MODEL PIPELINE + ARTIFACT STORE
+# Feature engineering, categorical encoding and the classifier as one
+# scikit-learn Pipeline, so everything learned in fit() — the
+# TotalCharges median, the category -> code mappings, the trees — is
+# saved together and reused when scoring new customers (score.py).
+#
+# Artifacts are written uncompressed by default so load() can memory-map
+# the tree arrays: loading is near-instant and scoring processes share
+# the pages. Set Q2_MODEL_COMPRESS=1..9 for a smaller file to ship
+# instead (it is then read fully into memory).
+# ================================================
+
+import json
+import os
+from contextlib import nullcontext
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.inspection import permutation_importance
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+from threadpoolctl import threadpool_limits
+
+import cache
+
+MODEL_PATH = os.environ.get("Q2_MODEL_PATH", "churn_model.joblib")
+MODEL_COMPRESS = int(os.environ.get("Q2_MODEL_COMPRESS", "0"))
+
+# Cores used to grow (and score) the forest; -1 = all. Every tree's seed
+# is drawn from random_state before any work is dispatched, so the fitted
+# model is identical for any value. Also caps the OpenMP threads of "hgb".
+N_JOBS = int(os.environ.get("Q2_N_JOBS", "-1"))
+
+# Model backend: "rf" (random forest on ordinal codes) or "hgb" (histogram
+# gradient boosting on the raw categoricals, with early stopping)
+MODEL = os.environ.get("Q2_MODEL", "rf").lower()
+MODELS = ("rf", "hgb")
+
+# Q2_IMPORTANCE=permutation ranks features by permutation importance on the
+# test split (always used for "hgb"); results are cached under DA_CACHE_DIR by
+# model hash + data fingerprint, so re-running a report does not recompute
+# (DA_CACHE=0 disables this like the table cache).
+IMPORTANCE = os.environ.get("Q2_IMPORTANCE", "impurity").lower()
+PERMUTATION_REPEATS = int(os.environ.get("Q2_PERMUTATION_REPEATS", "10"))
+
+TARGET = "Churn"
+
+NUMERIC = ["SeniorCitizen", "tenure", "MonthlyCharges", "TotalCharges"]
+CATEGORICAL = [
+    "gender", "Partner", "Dependents", "PhoneService", "MultipleLines",
+    "InternetService", "OnlineSecurity", "OnlineBackup", "DeviceProtection",
+    "TechSupport", "StreamingTV", "StreamingMovies", "Contract",
+    "PaperlessBilling", "PaymentMethod",
+]
+# Raw q2_data columns the pipeline reads
+FEATURES = NUMERIC + CATEGORICAL
+# Features + target in q2_data's column order: what Q2.py loads (and caches);
+# the id columns are never fetched
+COLUMNS = [
+    "gender", "SeniorCitizen", "Partner", "Dependents", "tenure", "PhoneService",
+    "MultipleLines", "InternetService", "OnlineSecurity", "OnlineBackup",
+    "DeviceProtection", "TechSupport", "StreamingTV", "StreamingMovies", "Contract",
+    "PaperlessBilling", "PaymentMethod", "MonthlyCharges", "TotalCharges", "Churn",
+]
+# Load dtypes for them (the categoricals come from schema.py)
+DTYPES = {col: "float64" for col in NUMERIC}
+
+TENURE_BINS = [0, 12, 24, 48, 72]
+TENURE_LABELS = ["0-1 Year", "1-2 Years", "2-4 Years", "4-6 Years"]
+
+
+class ChurnFeatures(BaseEstimator, TransformerMixin):
+    """
+    Q2's cleaning and feature engineering as a transformer: TotalCharges
+    parsed and filled with the training median, tenure filled with 0,
+    plus AvgMonthlySpend and TenureGroup.
+    """
+
+    def fit(self, X, y=None):
+        self.total_charges_median_ = pd.to_numeric(X["TotalCharges"], errors="coerce").median()
+        return self
+
+    def transform(self, X):
+        X = X[FEATURES].copy()
+        X["TotalCharges"] = pd.to_numeric(X["TotalCharges"], errors="coerce").fillna(self.total_charges_median_)
+        X["tenure"] = X["tenure"].fillna(0)
+        X["AvgMonthlySpend"] = X["TotalCharges"] / X["tenure"].replace(0, 1)
+        X["TenureGroup"] = pd.cut(X["tenure"], bins=TENURE_BINS, labels=TENURE_LABELS)
+        # No-op for frames loaded with schema.py; raw text gets categorized
+        X[CATEGORICAL] = X[CATEGORICAL].astype("category")
+        return X
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array(FEATURES + ["AvgMonthlySpend", "TenureGroup"], dtype=object)
+
+
+ENCODINGS = ("ordinal", "onehot")
+
+
+def encoder(kind="ordinal"):
+    """
+    All categorical columns encoded in one vectorized call.
+    "ordinal": integer codes, categories sorted as LabelEncoder sorted them;
+    missing and unseen values get -1, so scoring never has to refit.
+    "onehot": one 0/1 column per category; unseen values are all zeros.
+    """
+    if kind == "ordinal":
+        categorical = OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1,
+                                     encoded_missing_value=-1, dtype=np.float32)
+    elif kind == "onehot":
+        categorical = OneHotEncoder(handle_unknown="ignore", sparse_output=False, dtype=np.float32)
+    else:
+        raise ValueError(f"Unknown encoding '{kind}', expected one of {ENCODINGS}")
+    return ColumnTransformer(
+        [("categorical", categorical, CATEGORICAL + ["TenureGroup"])],
+        remainder="passthrough",
+        verbose_feature_names_out=False,
+    )
+
+
+def forest(n_estimators=250, max_samples=None, n_jobs=N_JOBS, random_state=42, **params):
+    """
+    The Q2 random forest; max_samples < 1.0 bootstraps a fraction of the
+    rows per tree. Other RandomForestClassifier `params` pass through.
+    """
+    return RandomForestClassifier(n_estimators=n_estimators, max_samples=max_samples,
+                                  n_jobs=n_jobs, random_state=random_state, **params)
+
+
+def boosting(max_iter=500, learning_rate=0.1, random_state=42, **params):
+    """
+    Histogram gradient boosting that splits on the categorical columns
+    natively (categories taken from the pandas dtype, unseen ones treated
+    as missing). Stops once 10 rounds pass without improving the loss on
+    a 10% validation split. Other HistGradientBoostingClassifier `params`
+    pass through.
+    """
+    return HistGradientBoostingClassifier(
+        max_iter=max_iter, learning_rate=learning_rate,
+        categorical_features="from_dtype",
+        early_stopping=True, validation_fraction=0.1, n_iter_no_change=10,
+        random_state=random_state, **params,
+    )
+
+
+def default_model(backend=MODEL):
+    """The Q2 classifier for `backend` ("rf" or "hgb")."""
+    if backend not in MODELS:
+        raise ValueError(f"Unknown model '{backend}', expected one of {MODELS}")
+    return forest() if backend == "rf" else boosting()
+
+
+def build_pipeline(model=None, encoding="ordinal"):
+    """
+    Features -> encoder -> classifier (Q2_MODEL's default model when None).
+    Gradient boosting reads the categoricals directly, so it has no encoder.
+    """
+    if model is None:
+        model = default_model()
+    steps = [("features", ChurnFeatures())]
+    if not isinstance(model, HistGradientBoostingClassifier):
+        steps.append(("encode", encoder(encoding)))
+    steps.append(("model", model))
+    return Pipeline(steps).set_output(transform="pandas")
+
+
+def training_threads(limit=N_JOBS):
+    """Context that caps OpenMP (gradient boosting) threads at `limit` when it is positive."""
+    return threadpool_limits(limits=limit, user_api="openmp") if limit > 0 else nullcontext()
+
+
+def target(df):
+    """Churn as 0/1 (No/Yes), the coding LabelEncoder produced."""
+    return (df[TARGET].astype(str) == "Yes").astype(int)
+
+
+def permutation_importances(pipeline, X, y, n_repeats=PERMUTATION_REPEATS):
+    """
+    Drop in accuracy when each model input feature is shuffled, over
+    `n_repeats` shuffles of `X`, `y`: columns importance, std and ci95
+    (half-width of the 95% confidence interval of the mean).
+
+    The repeats run on a process pool of N_JOBS workers. The result is
+    cached by the hash of the fitted pipeline and of the data, so the same
+    model scored on the same rows is only permuted once (unless DA_CACHE=0).
+    """
+    model = pipeline.named_steps["model"]
+    path = None
+    if cache.ENABLED:
+        key = joblib.hash([joblib.hash(pipeline), joblib.hash((X, y)), n_repeats])
+        path = os.path.join(cache.CACHE_DIR, f"permutation-{key}.pkl")
+        if os.path.exists(path):
+            print(f"✓ Permutation importance served from cache ({path})")
+            return pd.read_pickle(path)
+
+    result = permutation_importance(model, pipeline[:-1].transform(X), y, n_repeats=n_repeats,
+                                    n_jobs=N_JOBS, random_state=42)
+    table = pd.DataFrame({
+        "importance": result.importances_mean,
+        "std": result.importances_std,
+        "ci95": 1.96 * result.importances_std / np.sqrt(n_repeats),
+    }, index=model.feature_names_in_)
+
+    if path is not None:
+        os.makedirs(cache.CACHE_DIR, exist_ok=True)
+        table.to_pickle(path + ".tmp")
+        os.replace(path + ".tmp", path)
+    return table
+
+
+def feature_importance(pipeline, X=None, y=None):
+    """
+    Importances of the fitted model, indexed by model input feature: the
+    impurity importances for the forest, or for models without them
+    (gradient boosting) the mean permutation importance on `X`, `y`.
+    """
+    model = pipeline.named_steps["model"]
+    if hasattr(model, "feature_importances_"):
+        return pd.Series(model.feature_importances_, index=model.feature_names_in_)
+    if X is None:
+        raise ValueError(f"{type(model).__name__} needs X, y for permutation importance")
+    return permutation_importances(pipeline, X, y)["importance"]
+
+
+def _read_meta(path):
+    try:
+        with open(path + ".json") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def save(pipeline, path=MODEL_PATH, compress=MODEL_COMPRESS, **info):
+    """
+    Atomically write the fitted pipeline to `path`, plus a .json sidecar
+    with the training details in `info` (rows, accuracy, ...).
+    """
+    joblib.dump(pipeline, path + ".tmp", compress=compress)
+    os.replace(path + ".tmp", path)
+    meta = {
+        "saved_at": datetime.now().isoformat(timespec="seconds"),
+        "sklearn": sklearn.__version__,
+        "compress": compress,
+        **info,
+    }
+    with open(path + ".json.tmp", "w") as fh:
+        json.dump(meta, fh, indent=2, default=str)
+    os.replace(path + ".json.tmp", path + ".json")
+    return path
+
+
+def load(path=MODEL_PATH):
+    """Load a saved pipeline, memory-mapping its arrays when the file is uncompressed."""
+    meta = _read_meta(path) or {}
+    if meta.get("sklearn", sklearn.__version__) != sklearn.__version__:
+        print(f"⚠ {path} was saved with scikit-learn {meta['sklearn']}, running {sklearn.__version__}")
+    mmap_mode = None if meta.get("compress") else "r"
+    return joblib.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,184 @@
+# ================================================
+# Q2 OUT-OF-CORE CHURN TRAINING
+# For q2_data tables larger than RAM: rows are streamed in chunks from
+# MySQL or from the local Feather snapshot and never held all at once.
+#
+#   pass 1  collect every category of every categorical column plus a
+#           uniform reservoir sample; fit the feature/encoding stage on
+#           them (one-hot over the complete category lists, so every
+#           chunk encodes to the same columns; medians and scaling from
+#           the sample)
+#   pass 2+ SGDClassifier.partial_fit on each chunk's training rows
+#   last    score the held-out rows and print the Q2 metrics
+#
+# A row is held out by a hash of its position in a fixed order (MySQL
+# rows are read ORDER BY customerID, the snapshot's order is fixed on
+# disk), so every pass holds out the same rows whatever the chunk sizes,
+# and they are never trained on. The fitted pipeline is saved like Q2's model,
+# so score.py can use it.
+#
+# Config (env):
+#   STREAM_SOURCE   "mysql" (default) or "cache" (the Feather snapshot,
+#                   which must be up to date with the table)
+#   STREAM_CHUNK    rows per chunk (default 100000)
+#   STREAM_EPOCHS   training passes (default 3)
+#   STREAM_HOLDOUT  held-out share of rows (default 0.2)
+#   STREAM_SAMPLE   reservoir sample size (default 100000)
+# ================================================
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from db import get_connection
+from cache import iter_cached
+from churn import (CATEGORICAL, COLUMNS, DTYPES, FEATURES, TARGET, TENURE_LABELS, ChurnFeatures,
+                   save, target)
+from loader import iter_chunks
+
+TABLE = "q2_data"
+ORDER_KEY = "customerID"
+
+SOURCE = os.environ.get("STREAM_SOURCE", "mysql").lower()
+CHUNK = int(os.environ.get("STREAM_CHUNK", "100000"))
+EPOCHS = int(os.environ.get("STREAM_EPOCHS", "3"))
+HOLDOUT = float(os.environ.get("STREAM_HOLDOUT", "0.2"))
+SAMPLE = int(os.environ.get("STREAM_SAMPLE", "100000"))
+
+DERIVED_NUMERIC = ["AvgMonthlySpend"]
+
+
+def stream(source=SOURCE, chunksize=CHUNK):
+    """Yield q2_data in chunks from MySQL, or from the Feather snapshot cached_load wrote."""
+    conn = get_connection()
+    try:
+        if source == "cache":
+            yield from iter_cached(conn, TABLE, COLUMNS, DTYPES, chunksize=chunksize)
+        else:
+            yield from iter_chunks(conn, TABLE, COLUMNS, DTYPES, chunksize=chunksize,
+                                   order_by=[ORDER_KEY])
+    finally:
+        conn.close()
+
+
+def held_out(start, n):
+    """Held-out mask for stream rows start..start + n: a hash of each row's position, not of its chunk."""
+    positions = np.arange(start, start + n, dtype=np.int64)
+    return pd.util.hash_array(positions) % 10_000 < HOLDOUT * 10_000
+
+
+def labelled(source=SOURCE):
+    """Chunks with a Churn label, each paired with its held-out mask (same on every pass)."""
+    start = 0
+    for chunk in stream(source):
+        mask = held_out(start, len(chunk))
+        start += len(chunk)
+        keep = chunk[TARGET].notna().to_numpy()
+        yield chunk[keep].reset_index(drop=True), mask[keep]
+
+
+def scan(source=SOURCE, sample_size=SAMPLE):
+    """Pass 1: every category seen per categorical column, and a uniform sample of training rows."""
+    categories = {col: set() for col in CATEGORICAL}
+    rng = np.random.default_rng(7)
+    sample, keys = None, None
+    for chunk, mask in labelled(source):
+        for col in CATEGORICAL:
+            categories[col].update(chunk[col].dropna().unique())
+        # Reservoir via random keys: keep the sample_size smallest
+        train = chunk[~mask]
+        pool = train if sample is None else pd.concat([sample, train], ignore_index=True)
+        pool_keys = rng.random(len(train)) if keys is None else np.concatenate([keys, rng.random(len(train))])
+        keep = np.argsort(pool_keys, kind="stable")[:sample_size]
+        sample, keys = pool.iloc[keep].reset_index(drop=True), pool_keys[keep]
+    return {col: sorted(values, key=str) for col, values in categories.items()}, sample
+
+
+def stream_encoder(categories):
+    """One-hot over the complete category lists, imputed + standardized numerics."""
+    cat_cols = CATEGORICAL + ["TenureGroup"]
+    cat_lists = [categories[col] for col in CATEGORICAL] + [TENURE_LABELS]
+    numeric = [c for c in FEATURES if c not in CATEGORICAL] + DERIVED_NUMERIC
+    return ColumnTransformer(
+        [
+            ("categorical", OneHotEncoder(categories=cat_lists, handle_unknown="ignore",
+                                          sparse_output=False, dtype=np.float32), cat_cols),
+            ("numeric", make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric),
+        ],
+        verbose_feature_names_out=False,
+    )
+
+
+def main():
+    start = time.perf_counter()
+
+    # -----------------------
+    # 1) Pass 1: categories + sample -> fitted encoding stage
+    # -----------------------
+    try:
+        categories, sample = scan()
+    except Exception as e:
+        print(f"✗ Could not stream '{TABLE}' from {SOURCE}: {e}")
+        exit(1)
+    if sample is None or sample.empty:
+        print(f"✗ No labelled rows in '{TABLE}'")
+        exit(1)
+    prep = Pipeline([("features", ChurnFeatures()), ("encode", stream_encoder(categories))])
+    prep.set_output(transform="pandas").fit(sample)
+    print(f"✓ Encodings fitted: {sum(map(len, categories.values()))} categories, "
+          f"{len(sample)}-row sample ({time.perf_counter() - start:.1f}s)")
+
+    # -----------------------
+    # 2) Training passes
+    # -----------------------
+    model = SGDClassifier(loss="log_loss", alpha=1e-4, random_state=42)
+    classes = np.array([0, 1])
+    rows = 0
+    for epoch in range(EPOCHS):
+        rows = 0
+        for chunk, mask in labelled():
+            train = chunk[~mask]
+            if len(train):
+                model.partial_fit(prep.transform(train), target(train), classes=classes)
+                rows += len(train)
+        print(f"✓ Epoch {epoch + 1}/{EPOCHS}: trained on {rows} rows "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    # -----------------------
+    # 3) Held-out evaluation
+    # -----------------------
+    y_true, y_pred = [], []
+    for chunk, mask in labelled():
+        test = chunk[mask]
+        if len(test):
+            y_true.append(target(test).to_numpy())
+            y_pred.append(model.predict(prep.transform(test)))
+
+    accuracy = None
+    if y_true:
+        y_test, pred = np.concatenate(y_true), np.concatenate(y_pred)
+        score = accuracy_score(y_test, pred)
+        accuracy = round(score, 4)
+        print(f"\nHeld-out rows: {len(y_test)}")
+        print("\nModel Accuracy:", score)
+        print("\nClassification Report:\n", classification_report(y_test, pred))
+        print("\nConfusion Matrix:\n", confusion_matrix(y_test, pred))
+    else:
+        print(f"\n⚠ No held-out rows to score (STREAM_HOLDOUT={HOLDOUT})")
+
+    pipeline = Pipeline(prep.steps + [("model", model)])
+    # rows: the training rows of one pass (every pass sees the same ones)
+    path = save(pipeline, backend="sgd", rows=rows, accuracy=accuracy)
+    print(f"\n✓ Streaming model saved -> {path}")
+
+
+if __name__ == "__main__":
+    main()
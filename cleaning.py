@@ -0,0 +1,167 @@
+# ================================================
+# VECTORIZED CLEANERS
+# Column-at-a-time replacements for the per-row .apply helpers in
+# the Q scripts. Each one keeps the behaviour of the function it
+# replaces; benchmarks/ compares them against the originals.
+# ================================================
+
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:  # Arrow-backed strings are optional
+    pa = pc = None
+    TEXT_DTYPE = "string"
+
+
+def parse_hhmm(values):
+    """
+    Parse HHMM clock values such as '1110', '1' or '635' into minutes
+    since midnight (nullable Int16).
+
+    Non-digit characters are dropped first; anything that is empty,
+    longer than four digits or not a valid 24-hour time becomes <NA>,
+    matching Q4's old per-row fix_time.
+    """
+    s = pd.Series(values)
+    digits = s.astype(str).str.replace(r"\D", "", regex=True)
+    digits = digits.where(s.notna() & digits.str.len().between(1, 4))
+
+    hhmm = pd.to_numeric(digits, errors="coerce")
+    hours, minutes = hhmm // 100, hhmm % 100
+    valid = (hours < 24) & (minutes < 60)
+    return (hours * 60 + minutes).where(valid).astype("Int16")
+
+
+# Every character Python's re treats as \s, spelled out so the Arrow
+# (RE2) regex engine, whose \s is ASCII-only, matches the same set.
+WHITESPACE = "[\\s\x0b\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+"
+
+
+def normalize_text(frame, columns):
+    """
+    Collapse whitespace runs to one space and strip each of `columns`
+    in place, one vectorized pass per column. Missing values become "".
+    Same output as Q3's old per-row clean_text, stored as TEXT_DTYPE.
+    """
+    for col in columns:
+        frame[col] = (
+            frame[col]
+            .astype(TEXT_DTYPE)
+            .fillna("")
+            .str.replace(WHITESPACE, " ", regex=True)
+            .str.strip()
+        )
+    return frame
+
+
+# First number in the text (thousands commas allowed) plus an optional
+# K/M/B magnitude suffix: "$1,234", "7.5/10", "$1.2M", "3 Billion", "450k"
+NUMBER_PATTERN = r"(?P<number>\d[\d,]*(?:\.\d*)?)\s*(?:(?P<suffix>[KkMmBb])(?:illion|n)?\b)?"
+MAGNITUDES = {"k": 1e3, "m": 1e6, "b": 1e9}
+
+
+def parse_number(values, dtype="float64"):
+    """
+    Parse currency / count text into numbers with a single regex pass.
+    Currency symbols and other text around the first number are ignored,
+    K/M/B (or Million/Billion/bn) scale it, and anything without digits
+    becomes NaN. Returns a Series of `dtype`.
+
+    With pyarrow the pass runs in Arrow's RE2 kernel; pandas' str.extract
+    would fall back to Python's re for every row.
+    """
+    s = pd.Series(values)
+    text = s.astype(str)
+
+    if pc is not None:
+        parts = pc.extract_regex(pa.array(text, type=pa.string(), from_pandas=True), NUMBER_PATTERN)
+        digits = pc.replace_substring(pc.struct_field(parts, "number"), ",", "")
+        number = pc.cast(digits, pa.float64())
+        suffix = pc.utf8_lower(pc.struct_field(parts, "suffix"))
+        magnitude = pc.index_in(suffix, value_set=pa.array(list(MAGNITUDES)))
+        scale = pa.array(list(MAGNITUDES.values())).take(magnitude).fill_null(1.0)
+        parsed = pc.multiply(number, scale).to_numpy(zero_copy_only=False)
+        return pd.Series(parsed, index=s.index).astype(dtype)
+
+    parts = text.str.extract(NUMBER_PATTERN)
+    number = pd.to_numeric(parts["number"].str.replace(",", "", regex=False), errors="coerce")
+    scale = parts["suffix"].str.lower().map(MAGNITUDES).fillna(1.0)
+    return (number * scale).astype(dtype)
+
+
+# Explicit lat/lon pairs like "(34.05, -118.24)" or "34.05, -118.24"
+COORD_PATTERN = r"([-+]?\d{1,3}\.\d+)[, ]+\s*([-+]?\d{1,3}\.\d+)"
+
+
+def extract_coords(values):
+    """
+    Pull the first lat/lon pair out of free-text locations in one
+    str.extract pass. Returns a float64 DataFrame with Lat and Lon
+    columns; rows without a pair are NaN.
+    """
+    s = pd.Series(values)
+    coords = s.astype(str).str.extract(COORD_PATTERN)
+    coords.columns = ["Lat", "Lon"]
+    return coords.astype(np.float64)
+
+
+GENRES = [
+    "Action", "Drama", "Comedy", "Thriller", "Horror",
+    "Sci-Fi", "Fantasy", "Romance", "Adventure",
+    "Documentary", "Animation", "Crime", "Mystery"
+]
+
+
+def genre_matrix(values, genres=GENRES):
+    """
+    Tag every genre mentioned in each text (case-insensitive substring
+    match) in a single regex pass. Returns a multi-hot boolean DataFrame
+    with one column per genre, in `genres` order.
+    """
+    s = pd.Series(values)
+    lowered = s.astype(str).str.lower().reset_index(drop=True)
+    codes = {g.lower(): i for i, g in enumerate(genres)}
+
+    # Zero-width lookahead so overlapping mentions are all found
+    pattern = "(?=(" + "|".join(re.escape(g) for g in codes) + "))"
+    found = lowered.str.extractall(pattern)[0]
+
+    tags = np.zeros((len(s), len(genres)), dtype=bool)
+    tags[found.index.get_level_values(0), found.map(codes).to_numpy(dtype=np.intp)] = True
+    return pd.DataFrame(tags, index=s.index, columns=list(genres))
+
+
+def primary_genre(tags, default="Unknown"):
+    """First tagged genre per row in column order (Q3's old single-genre label)."""
+    return tags.idxmax(axis=1).where(tags.any(axis=1), default)
+
+
+def recode(values, func=None, fill=None):
+    """
+    Categorical-aware replacement for `values.astype(str).map(func).fillna(fill)`.
+    `func` runs once per category rather than once per row; labels it maps
+    together are merged, and missing values become `fill` (kept missing
+    when None). Returns a categorical with sorted categories.
+    """
+    s = pd.Series(values)
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype("category")
+
+    old = s.cat.categories
+    labels = pd.Index([func(c) for c in old] if func else old, dtype=object)
+    new = labels.unique()
+    if fill is not None and fill not in new:
+        new = new.append(pd.Index([fill], dtype=object))
+    new = pd.Index(sorted(new))
+
+    # Old code -> new code; the trailing entry is where missing (-1) lands
+    missing = new.get_loc(fill) if fill is not None else -1
+    lookup = np.append(new.get_indexer(labels), missing)
+    recoded = lookup[s.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(recoded, categories=new), index=s.index, name=s.name)
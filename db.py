@@ -0,0 +1,111 @@
+# ================================================
+# SHARED DATABASE CONFIG + CONNECTION POOL
+# One config source for every script; connections are handed out
+# from a per-process mysql.connector pool. The pool opens connections
+# on demand (up to pool_size), so a process only authenticates for the
+# connections it actually borrows at the same time.
+#
+# Settings are read in this order (later wins):
+#   1. DEFAULTS below
+#   2. [mysql] section of db.ini (path overridable with DA_DB_CONFIG)
+#   3. DA_DB_<KEY> environment variables, e.g. DA_DB_PASSWORD
+# ================================================
+
+import configparser
+import os
+import threading
+
+from mysql.connector import HAVE_CEXT, errors, pooling
+
+CONFIG_FILE = os.environ.get("DA_DB_CONFIG", "db.ini")
+
+DEFAULTS = {
+    "host": "localhost",
+    "port": 3306,
+    "user": "root",
+    "password": "admin",
+    "database": "testdb",
+    "connection_timeout": 10,
+    "autocommit": True,
+    # False selects the C extension; get_pool() falls back to the
+    # pure-Python protocol parser when the extension is not installed.
+    "use_pure": False,
+    # Upper bound on connections open at once per process; they are opened lazily
+    "pool_size": 5,
+}
+
+_INT_KEYS = {"port", "connection_timeout", "pool_size"}
+_BOOL_KEYS = {"autocommit", "use_pure"}
+
+
+def _convert(key, value):
+    if key in _INT_KEYS:
+        return int(value)
+    if key in _BOOL_KEYS:
+        return str(value).strip().lower() in ("1", "true", "yes", "on")
+    return value
+
+
+def load_config(path=None):
+    """Merge defaults, the [mysql] section of the config file and DA_DB_* env vars."""
+    config = dict(DEFAULTS)
+
+    parser = configparser.ConfigParser()
+    if parser.read(path or CONFIG_FILE) and parser.has_section("mysql"):
+        for key, value in parser.items("mysql"):
+            config[key] = _convert(key, value)
+
+    for key in DEFAULTS:
+        value = os.environ.get(f"DA_DB_{key.upper()}")
+        if value is not None:
+            config[key] = _convert(key, value)
+    return config
+
+
+_pool = None
+_pool_pid = None
+_opened = 0
+_lock = threading.Lock()
+
+
+def init_pool(pool_size=None):
+    """
+    (Re)create this process's pool without connecting; `pool_size` overrides
+    the configured cap. Usable as a ProcessPoolExecutor initializer.
+    """
+    global _pool, _pool_pid, _opened
+    config = load_config()
+    size = config.pop("pool_size")
+    if pool_size is not None:
+        size = pool_size
+    if not HAVE_CEXT:
+        config["use_pure"] = True
+    # No connection arguments to the constructor: it would open all
+    # pool_size connections up front. set_config() only records them.
+    _pool = pooling.MySQLConnectionPool(pool_name=f"analytics_{os.getpid()}", pool_size=size)
+    _pool.set_config(**config)
+    _pool_pid = os.getpid()
+    _opened = 0
+    return _pool
+
+
+def get_pool():
+    """Return this process's pool, creating it on first use (and again after a fork)."""
+    if _pool is None or _pool_pid != os.getpid():
+        init_pool()
+    return _pool
+
+
+def get_connection():
+    """Borrow a pooled connection, opening one if none is idle; close() hands it back to the pool."""
+    global _opened
+    pool = get_pool()
+    with _lock:
+        try:
+            return pool.get_connection()
+        except errors.PoolError:
+            if _opened >= pool.pool_size:
+                raise
+        pool.add_connection()
+        _opened += 1
+        return pool.get_connection()
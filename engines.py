@@ -0,0 +1,266 @@
+# ================================================
+# QUERY ENGINES FOR THE SALES (Q1) AND CRIME (Q4) SUMMARIES
+# The same logical analysis on pandas (default), DuckDB or Polars.
+#
+# An engine only computes grouped counts ordered by key. Ranking
+# (sort by count, head) then runs in pandas on those small results,
+# so every engine returns identical frames. DuckDB and Polars are
+# optional: selecting one that is not installed raises ImportError.
+# ================================================
+
+import numpy as np
+import pandas as pd
+
+ENGINES = ("pandas", "duckdb", "polars")
+
+
+# -----------------------
+# Grouped counts per engine
+#   derived:   {name: (kind, source_column)} with kind in
+#              day/isoweek/month/year
+#   groupings: {name: [key, ...]} over source and derived columns
+#   Each result has the keys plus an "n" column, null keys dropped,
+#   sorted by key.
+# -----------------------
+def _pandas_counts(df, derived, groupings, threads=None):
+    frame = {}
+    for name, (kind, src) in derived.items():
+        s = df[src]
+        if kind == "month":
+            frame[name] = s.dt.to_period("M")
+        elif kind == "day":
+            frame[name] = s.dt.date
+        elif kind == "year":
+            frame[name] = s.dt.year
+        else:
+            frame[name] = s.dt.isocalendar().week
+    keys = {k for ks in groupings.values() for k in ks if k not in derived}
+    frame = pd.DataFrame({**{k: df[k] for k in keys}, **frame})
+
+    return {
+        name: frame.groupby(ks, observed=True).size().reset_index(name="n")
+        for name, ks in groupings.items()
+    }
+
+
+def _duckdb_counts(df, derived, groupings, threads=None):
+    import duckdb
+
+    con = duckdb.connect()
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+
+    exprs = {
+        "month": "strftime(\"{}\", '%Y-%m')",
+        "day": "CAST(\"{}\" AS DATE)",
+        "isoweek": "weekofyear(\"{}\")",
+        "year": "year(\"{}\")",
+    }
+    keys = {k for ks in groupings.values() for k in ks if k not in derived}
+    sources = sorted(keys | {src for _, src in derived.values()})
+    con.register("src", df[sources])
+
+    # Materialised once so the groupings scan native columns, not the pandas
+    # frame; categoricals arrive as ENUMs and are compared as text like pandas
+    select = [f'CAST("{k}" AS VARCHAR) AS "{k}"' if isinstance(df[k].dtype, pd.CategoricalDtype)
+              else f'"{k}"' for k in sorted(keys)]
+    select += [exprs[kind].format(src) + f' AS "{name}"' for name, (kind, src) in derived.items()]
+    con.execute(f"CREATE TEMP TABLE rows AS SELECT {', '.join(select)} FROM src")
+
+    out = {}
+    for name, ks in groupings.items():
+        key_sql = ", ".join(f'"{k}"' for k in ks)
+        not_null = " AND ".join(f'"{k}" IS NOT NULL' for k in ks)
+        out[name] = con.execute(
+            f"SELECT {key_sql}, COUNT(*) AS n FROM rows WHERE {not_null} "
+            f"GROUP BY {key_sql} ORDER BY {key_sql}"
+        ).df()
+    con.close()
+    return out
+
+
+def _polars_counts(df, derived, groupings, threads=None):
+    # Polars sizes its thread pool from POLARS_MAX_THREADS at import time
+    import polars as pl
+
+    exprs = {
+        "month": lambda c: pl.col(c).dt.strftime("%Y-%m"),
+        "day": lambda c: pl.col(c).dt.date(),
+        "isoweek": lambda c: pl.col(c).dt.week(),
+        "year": lambda c: pl.col(c).dt.year(),
+    }
+    keys = {k for ks in groupings.values() for k in ks if k not in derived}
+    sources = sorted(keys | {src for _, src in derived.values()})
+
+    frame = (
+        pl.from_pandas(df[sources])
+          .lazy()
+          .with_columns(pl.col(pl.Categorical).cast(pl.Utf8))
+          .with_columns([exprs[kind](src).alias(name) for name, (kind, src) in derived.items()])
+    )
+    return {
+        name: (
+            frame.drop_nulls(ks)
+                 .group_by(ks)
+                 .agg(pl.len().alias("n"))
+                 .sort(ks)
+                 .collect()
+                 .to_pandas()
+        )
+        for name, ks in groupings.items()
+    }
+
+
+_COUNTERS = {"pandas": _pandas_counts, "duckdb": _duckdb_counts, "polars": _polars_counts}
+
+
+def group_counts(df, derived, groupings, engine="pandas", threads=None):
+    """Grouped counts on `engine`, normalised to the pandas engine's dtypes."""
+    if engine not in _COUNTERS:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+    out = _COUNTERS[engine](df, derived, groupings, threads)
+
+    for name, counts in out.items():
+        for k in groupings[name]:
+            kind = derived.get(k, (None,))[0]
+            if kind == "month" and not isinstance(counts[k].dtype, pd.PeriodDtype):
+                counts[k] = pd.PeriodIndex(counts[k], freq="M")
+            elif kind == "day" and pd.api.types.is_datetime64_any_dtype(counts[k]):
+                counts[k] = counts[k].dt.date
+            elif kind == "isoweek":
+                counts[k] = counts[k].astype("UInt32")
+            elif kind == "year":
+                counts[k] = counts[k].astype("int32")
+            elif kind is None and counts[k].dtype != df[k].dtype:
+                counts[k] = counts[k].astype(df[k].dtype)
+        counts["n"] = counts["n"].astype("int64")
+        out[name] = counts.reset_index(drop=True)
+    return out
+
+
+# -----------------------
+# Analyses
+# -----------------------
+def sales_summary(df, engine="pandas", threads=None):
+    """
+    Q1 aggregates over cleaned q1 rows (Order_Date parsed, Region filled):
+    top_products, top_regions, monthly_trends and regional_strength.
+    """
+    counts = group_counts(
+        df,
+        derived={"Month": ("month", "Order_Date")},
+        groupings={
+            "products": ["Product_Name"],
+            "regions": ["Region"],
+            "months": ["Month"],
+            "product_regions": ["Product_Name", "Region"],
+        },
+        engine=engine,
+        threads=threads,
+    )
+    counts = {name: c.rename(columns={"n": "transactions"}) for name, c in counts.items()}
+    return {
+        "top_products": counts["products"].sort_values("transactions", ascending=False).head(10),
+        "top_regions": counts["regions"].sort_values("transactions", ascending=False),
+        "monthly_trends": counts["months"],
+        "regional_strength": counts["product_regions"],
+    }
+
+
+CRIME_DERIVED = {
+    "Day": ("day", "DATE_OCC"),
+    "Week": ("isoweek", "DATE_OCC"),
+    "Month": ("month", "DATE_OCC"),
+    "Year": ("year", "DATE_OCC"),
+}
+CRIME_GROUPINGS = {
+    "daily": ["Day"],
+    "weekly": ["Week"],
+    "monthly": ["Month"],
+    "yearly": ["Year"],
+    "areas": ["AREA_NAME_alias"],
+    "crimes": ["Crm_Cd_Desc_alias"],
+}
+
+
+def _key_counts(values, mask):
+    """Counts per distinct non-null value of `values[mask]`, keys in sorted order."""
+    codes, uniques = pd.factorize(values[mask], sort=True)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    keep = counts > 0
+    return pd.DataFrame({values.name: uniques[keep], "n": counts[keep]})
+
+
+def iso_weeks(days):
+    """ISO-8601 week numbers for an array of datetime64[D] values."""
+    ordinal = days.astype(np.int64)           # 1970-01-01 was a Thursday
+    thursday = ordinal - (ordinal + 3) % 7 + 3
+    year_start = thursday.astype("datetime64[D]").astype("datetime64[Y]").astype("datetime64[D]")
+    return (thursday - year_start.astype(np.int64)) // 7 + 1
+
+
+def crime_buckets(df):
+    """
+    Single-pass pandas-engine crime counts. DATE_OCC is reduced to integer
+    day ordinals and counted with one np.bincount; the ISO-week, month and
+    year buckets are then re-binned from that daily histogram (one entry per
+    calendar day, not per row). Area and crime-type tallies are bincounts
+    of their factorized codes. Rows with a missing DATE_OCC are skipped and
+    the frame is never copied.
+    """
+    dates = df["DATE_OCC"].to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(dates)
+    if not valid.any():
+        return group_counts(df.iloc[:0], CRIME_DERIVED, CRIME_GROUPINGS)
+
+    ordinals = dates[valid].astype(np.int64)
+    first = ordinals.min()
+    daily = np.bincount(ordinals - first)
+    days = np.arange(first, first + len(daily)).astype("datetime64[D]")
+    seen = daily > 0
+
+    def rebin(keys):
+        keys = keys[seen]
+        lo = keys.min()
+        counts = np.bincount(keys - lo, weights=daily[seen]).astype(np.int64)
+        nz = np.flatnonzero(counts)
+        return nz + lo, counts[nz]
+
+    weeks, weekly = rebin(iso_weeks(days))
+    months, monthly = rebin(days.astype("datetime64[M]").astype(np.int64))
+    years, yearly = rebin(days.astype("datetime64[Y]").astype(np.int64))
+
+    return {
+        "daily": pd.DataFrame({"Day": pd.DatetimeIndex(days[seen]).date, "n": daily[seen]}),
+        "weekly": pd.DataFrame({"Week": pd.array(weeks, dtype="UInt32"), "n": weekly}),
+        "monthly": pd.DataFrame({
+            "Month": pd.PeriodIndex(months.astype("datetime64[M]"), freq="M"),
+            "n": monthly,
+        }),
+        "yearly": pd.DataFrame({"Year": (years + 1970).astype(np.int32), "n": yearly}),
+        "areas": _key_counts(df["AREA_NAME_alias"], valid),
+        "crimes": _key_counts(df["Crm_Cd_Desc_alias"], valid),
+    }
+
+
+def crime_summary(df, engine="pandas", threads=None):
+    """
+    Q4 aggregates over crime rows with a valid DATE_OCC (rows where it is
+    NaT are ignored): daily_crime, weekly_crime (ISO week number),
+    monthly_crime, yearly_crime, top_areas, top_crimes.
+    """
+    if engine == "pandas":
+        counts = crime_buckets(df)
+    else:
+        cols = ["DATE_OCC", "AREA_NAME_alias", "Crm_Cd_Desc_alias"]
+        counts = group_counts(df.loc[df["DATE_OCC"].notna(), cols],
+                              CRIME_DERIVED, CRIME_GROUPINGS, engine=engine, threads=threads)
+    counts = {name: c.rename(columns={"n": "Incidents"}) for name, c in counts.items()}
+    return {
+        "daily_crime": counts["daily"],
+        "weekly_crime": counts["weekly"],
+        "monthly_crime": counts["monthly"],
+        "yearly_crime": counts["yearly"],
+        "top_areas": counts["areas"].sort_values("Incidents", ascending=False),
+        "top_crimes": counts["crimes"].sort_values("Incidents", ascending=False),
+    }
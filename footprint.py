@@ -0,0 +1,97 @@
+# ================================================
+# MEMORY FOOTPRINT: LOAD-TIME DOWNCASTING + REPORTS
+# Every table loaded through loader.load_table is shrunk column by
+# column before it is cached or analysed:
+#   - integers, and floats holding only whole numbers, become the
+#     smallest integer type that fits (float32 if they have gaps)
+#   - other floats become float32 only where that is exact; the rest
+#     (coordinates, prices) stay float64 rather than change value
+#   - text with few distinct values becomes a categorical, the rest
+#     Arrow-backed strings
+# and the deep memory_usage before/after is printed per table.
+#
+# Set DA_DOWNCAST=0 to keep the types as loaded.
+# ================================================
+
+import os
+
+import numpy as np
+import pandas as pd
+
+ENABLED = os.environ.get("DA_DOWNCAST", "1") != "0"
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+# Bumped whenever the rules below change what a column is loaded as;
+# part of the cache key so older snapshots are not reused
+RULES_VERSION = 2
+
+try:  # pandas >= 2.3 with pyarrow: the NaN-semantics string type pandas 3 uses by default
+    ARROW_STRING = pd.StringDtype("pyarrow", na_value=np.nan)
+except (ImportError, TypeError, ValueError):
+    ARROW_STRING = None
+
+
+def memory_mb(df):
+    """Deep memory use of `df` in MiB, string payloads included."""
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def _is_text(s):
+    if pd.api.types.is_string_dtype(s.dtype) and not isinstance(s.dtype, pd.CategoricalDtype):
+        return s.dtype != object or pd.api.types.infer_dtype(s, skipna=True) == "string"
+    return False
+
+
+def downcast_series(s):
+    """One column in the smallest type described above; other columns are returned as is."""
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind in "iu":
+        return pd.to_numeric(s, downcast="integer")
+
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind == "f":
+        values = s.to_numpy()
+        finite = values[np.isfinite(values)]
+        whole = len(finite) > 0 and np.array_equal(finite, np.trunc(finite))
+        if whole and len(finite) == len(values):
+            return pd.to_numeric(s.astype(np.int64), downcast="integer")
+        with np.errstate(over="ignore"):
+            exact = np.array_equal(finite.astype(np.float32).astype(np.float64), finite)
+        return s.astype(np.float32) if exact else s
+
+    if _is_text(s) and len(s):
+        if s.nunique() <= len(s) * CATEGORY_RATIO:
+            return s.astype("category")
+        if ARROW_STRING is not None and s.dtype != ARROW_STRING:
+            return s.astype(ARROW_STRING)
+    return s
+
+
+def downcast(df):
+    """Return `df` with every column passed through downcast_series."""
+    return df.assign(**{col: downcast_series(df[col]) for col in df.columns})
+
+
+def report(label, df, before=None):
+    """Print the deep memory footprint of `df`, and the saving when `before` (MiB) is given."""
+    after = memory_mb(df)
+    if before is None:
+        print(f"✓ {label}: {len(df)} rows, {after:.2f} MB in memory")
+    else:
+        saved = 100 * (1 - after / before) if before else 0.0
+        print(f"✓ {label}: {len(df)} rows, {before:.2f} MB -> {after:.2f} MB in memory ({saved:.0f}% smaller)")
+    return after
+
+
+def optimize(df, label):
+    """Downcast `df` (unless DA_DOWNCAST=0) and print its before/after footprint."""
+    if not ENABLED:
+        report(label, df)
+        return df
+    before = memory_mb(df)
+    out = downcast(df)
+    report(label, out, before)
+    for col in df.columns:
+        if out[col].dtype != df[col].dtype:
+            print(f"    {col}: {df[col].dtype} -> {out[col].dtype}")
+    return out
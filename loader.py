@@ -0,0 +1,188 @@
+# ================================================
+# SHARED MYSQL LOADER
+# Column-projected, chunked reads used by Q1–Q5 and All.py
+#
+# Scripts name columns the way they clean headers (stripped, spaces as
+# underscores); resolve_columns maps those names onto the names stored
+# in the table, so "Order_Date" reads a column stored as "Order Date".
+# ================================================
+
+import pandas as pd
+
+from footprint import optimize
+from schema import table_dtypes
+
+# Rows fetched per round trip; each chunk is typed before the next one arrives
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def quote_ident(name):
+    """Backtick-quote a MySQL identifier."""
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def table_columns(conn, table):
+    """Return the column names of `table` in table order."""
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SHOW COLUMNS FROM {quote_ident(table)}")
+        return [row[0] for row in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def header_name(name):
+    """A stored column name as the scripts refer to it: stripped, spaces as underscores."""
+    return str(name).strip().replace(" ", "_")
+
+
+def resolve_columns(conn, table, columns):
+    """
+    Map each of `columns` to the name stored in `table`, matching on
+    header_name() and then case-insensitively. Names with no match map to
+    themselves, so MySQL reports them as unknown columns.
+    """
+    stored = table_columns(conn, table)
+    exact = {header_name(c): c for c in stored}
+    folded = {header_name(c).lower(): c for c in stored}
+    return {
+        name: exact.get(header_name(name), folded.get(header_name(name).lower(), name))
+        for name in columns
+    }
+
+
+def _select(name, stored):
+    return quote_ident(stored) if stored == name else f"{quote_ident(stored)} AS {quote_ident(name)}"
+
+
+def build_query(table, columns=None, where=None, order_by=None):
+    """
+    SELECT for `columns` (a list, or a {name: stored name} map from
+    resolve_columns, selected under the requested names) of `table`.
+    """
+    if isinstance(columns, dict):
+        cols = ", ".join(_select(name, stored) for name, stored in columns.items())
+    else:
+        cols = ", ".join(quote_ident(c) for c in columns) if columns else "*"
+    sql = f"SELECT {cols} FROM {quote_ident(table)}"
+    if where:
+        sql += f" WHERE {where}"
+    if order_by:
+        sql += " ORDER BY " + ", ".join(quote_ident(c) for c in order_by)
+    return sql
+
+
+def _coerce(series, dtype):
+    target = pd.api.types.pandas_dtype(dtype)
+    if isinstance(target, pd.CategoricalDtype):
+        coerced = series.astype(target)
+        lost = int((coerced.isna() & series.notna()).sum())
+        if lost:
+            print(f"⚠ {series.name}: {lost} values outside the declared categories loaded as missing")
+        return coerced
+    if target.kind in "iufb":
+        return pd.to_numeric(series, errors="coerce").astype(target)
+    if target.kind == "M":
+        return pd.to_datetime(series, errors="coerce")
+    return series.astype(target)
+
+
+def typed_frame(rows, names, dtypes):
+    """One fetched chunk of row tuples as a DataFrame with `dtypes` applied."""
+    frame = pd.DataFrame.from_records(rows, columns=names)
+    for col, dtype in (dtypes or {}).items():
+        if col in frame.columns:
+            frame[col] = _coerce(frame[col], dtype)
+    return frame
+
+
+def _concat(chunks):
+    """
+    Concatenate typed chunks, keeping categorical columns categorical.
+    Inferred categories differ per chunk, and pd.concat would fall back to
+    object for those columns, so each chunk is first recoded to the sorted
+    union of the categories (only codes change); code order is label order.
+    """
+    for col in chunks[0].columns:
+        dtypes = [c[col].dtype for c in chunks]
+        if isinstance(dtypes[0], pd.CategoricalDtype) and any(d != dtypes[0] for d in dtypes):
+            categories = dtypes[0].categories
+            for dtype in dtypes[1:]:
+                categories = categories.union(dtype.categories)
+            union = pd.CategoricalDtype(categories)
+            for chunk in chunks:
+                chunk[col] = chunk[col].astype(union)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def combine_chunks(chunks, table):
+    """
+    Concatenate typed chunks into one frame and downcast it (see
+    footprint.py). `chunks` is emptied before the downcast so the pieces
+    can be freed.
+    """
+    frame = _concat(chunks)
+    chunks.clear()
+    return optimize(frame, table)
+
+
+def iter_chunks(conn, table, columns=None, dtypes=None, where=None, params=None,
+                chunksize=DEFAULT_CHUNKSIZE, order_by=None):
+    """
+    Stream `table` through an unbuffered (server-side) cursor and yield
+    DataFrames of at most `chunksize` rows with `dtypes` applied on top of
+    the table's categorical columns from schema.py. `order_by` (column
+    names) fixes the row order, which MySQL otherwise does not promise.
+    Names are resolved against the table (resolve_columns); the frames
+    carry the requested names.
+    """
+    dtypes = table_dtypes(table, columns, dtypes)
+    if columns or order_by:
+        stored = resolve_columns(conn, table, list(columns or []) + list(order_by or []))
+        if columns:
+            columns = {name: stored[name] for name in columns}
+        if order_by:
+            order_by = [stored[name] for name in order_by]
+    cur = conn.cursor(buffered=False)
+    try:
+        cur.execute(build_query(table, columns, where, order_by), params)
+        names = [d[0] for d in cur.description]
+        while True:
+            rows = cur.fetchmany(chunksize)
+            if not rows:
+                break
+            yield typed_frame(rows, names, dtypes)
+    finally:
+        # An abandoned generator leaves rows on the wire; drain them so the
+        # connection can be reused.
+        if getattr(conn, "unread_result", False):
+            conn.consume_results()
+        cur.close()
+
+
+def load_table(conn, table, columns=None, dtypes=None, where=None, params=None,
+               chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Load `columns` of `table` into one typed DataFrame, downcast to the
+    smallest dtypes that hold it (see footprint.py).
+
+    Raw Python row objects exist for one chunk at a time, but every typed
+    chunk is kept until the final concat, so peak memory is about twice the
+    typed, not yet downcast, table. The chunks are released before the
+    downcast.
+    """
+    chunks = list(iter_chunks(conn, table, columns, dtypes, where, params, chunksize))
+    if not chunks:
+        return typed_frame([], columns or [], table_dtypes(table, columns, dtypes))
+    return combine_chunks(chunks, table)
+
+
+def read_query(conn, sql, params=None):
+    """Run an arbitrary SELECT (e.g. a server-side GROUP BY) and return its result set."""
+    cur = conn.cursor()
+    try:
+        cur.execute(sql, params)
+        names = [d[0] for d in cur.description]
+        return pd.DataFrame.from_records(cur.fetchall(), columns=names)
+    finally:
+        cur.close()
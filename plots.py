@@ -0,0 +1,279 @@
+# ================================================
+# HEADLESS CHART RENDERING
+# Every script draws through this module instead of pyplot's global
+# figure + plt.show(), which blocks batch runs and leaks one figure per
+# chart:
+#
+#   - the Agg backend is forced before pyplot is imported
+#   - each chart is a module-level draw function (line, scatter, bar, ...)
+#     plus the data it needs; render() opens one figure, draws, saves and
+#     always closes it, even when drawing fails
+#   - Renderer renders submitted charts on a pool of worker processes, so
+#     a script's dozen charts don't serialize behind its analysis
+#   - large inputs are reduced before they are drawn (or shipped to a
+#     worker): downsample() keeps at most PLOT_MAX_POINTS vertices of a
+#     line, points() turns a scatter past PLOT_MAX_POINTS into a 2D
+#     histogram, so render time stays flat as tables grow
+#
+# Worker processes start from a fork server where there is one, otherwise
+# spawned: a plain fork would copy a parent that may already be running
+# threaded engines (DuckDB, Polars, OpenMP) and can deadlock on a lock
+# held by one of their threads. Workers re-import the calling script
+# without running it (every script keeps its work under a __main__ guard),
+# and charts reach them as module-level draw functions plus data.
+#
+# Config (env):
+#   PLOT_WORKERS   render processes per script (default min(4, cores);
+#                  0 renders inline)
+#   PLOT_DPI       savefig resolution (default matplotlib's, 100)
+#   PLOT_MAX_POINTS   line vertices / scatter markers per chart (default 2000)
+#   PLOT_DOWNSAMPLE   "lttb" (default) or "minmax" for long line series
+#   PLOT_DENSITY_BINS 2D histogram cells per axis for dense scatters (default 100)
+# ================================================
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.colors import LinearSegmentedColormap, LogNorm, to_rgba
+
+WORKERS = int(os.environ.get("PLOT_WORKERS", str(min(4, os.cpu_count() or 1))))
+DPI = float(os.environ["PLOT_DPI"]) if os.environ.get("PLOT_DPI") else None
+MAX_POINTS = int(os.environ.get("PLOT_MAX_POINTS", "2000"))
+DOWNSAMPLE = os.environ.get("PLOT_DOWNSAMPLE", "lttb").lower()
+DENSITY_BINS = int(os.environ.get("PLOT_DENSITY_BINS", "100"))
+
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+# -----------------------
+# Figure lifecycle
+# -----------------------
+def render(path, draw, *args, figsize=(8, 5), **kwargs):
+    """Draw one chart with draw(ax, *args, **kwargs) and save it to `path`; the figure is always closed."""
+    fig, ax = plt.subplots(figsize=figsize)
+    try:
+        draw(ax, *args, **kwargs)
+        fig.tight_layout()
+        fig.savefig(path, dpi=DPI)
+    finally:
+        plt.close(fig)
+    return path
+
+
+class Renderer:
+    """
+    Renders a script's charts on worker processes. submit() queues a chart
+    and returns immediately; wait() blocks until every chart is on disk and
+    reports each file.
+    """
+
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._pending = []
+
+    def submit(self, path, draw, *args, figsize=(8, 5), **kwargs):
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(render(path, draw, *args, figsize=figsize, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            self._pending.append((path, future))
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(START_METHOD))
+        future = self._pool.submit(render, path, draw, *args, figsize=figsize, **kwargs)
+        self._pending.append((path, future))
+
+    def wait(self):
+        """Block until every submitted chart is rendered; returns the paths that were saved."""
+        saved = []
+        try:
+            for path, future in self._pending:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"✗ Chart {path} failed: {e}")
+                    continue
+                print(f"✓ Saved chart -> {path}")
+                saved.append(path)
+        finally:
+            self._pending = []
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        return saved
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.wait()
+
+
+# -----------------------
+# Data reduction (runs in the calling process, before submit)
+# -----------------------
+def _positions(x):
+    """Numeric x for the triangle areas: datetimes as ns, numbers as-is, anything else by position."""
+    values = np.asarray(x)
+    if values.dtype == object:
+        try:
+            values = pd.to_datetime(values).to_numpy()
+        except (TypeError, ValueError):
+            return np.arange(len(values), dtype=np.float64)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(np.float64)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def lttb(x, y, n):
+    """
+    Indices of the n points Largest-Triangle-Three-Buckets keeps: the first
+    and last point, plus from each of n - 2 equal buckets the point forming
+    the largest triangle with the previous pick and the next bucket's mean.
+    """
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    keep = np.empty(n, dtype=np.int64)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = edges[i + 2] if i + 2 < len(edges) else size
+        cx, cy = x[hi:nxt].mean(), y[hi:nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax(y, n):
+    """Indices of the min and max of each of n // 2 equal buckets, in order: every spike survives."""
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    bucket = np.arange(size) * (n // 2) // size
+    grouped = pd.Series(y).groupby(bucket)
+    return np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+
+
+def downsample(x, y, max_points=MAX_POINTS, method=DOWNSAMPLE):
+    """(x, y) reduced to at most max_points vertices with LTTB or min-max; short series pass through."""
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if len(y) <= max_points:
+        return x, y
+    keep = minmax(y, max_points) if method == "minmax" else lttb(_positions(x), y, max_points)
+    return x[keep], y[keep]
+
+
+def _cells(values, bins):
+    """
+    Uniform bin edges and each value's cell: one cell per value for small
+    integer ranges (scores, counts), else `bins` equal cells. Binning is
+    arithmetic, not a search, so it stays a single O(n) pass.
+    """
+    low, high = values.min(), values.max()
+    if high - low < bins and np.array_equal(values, np.round(values)):
+        edges = np.arange(low - 0.5, high + 1.5)
+    else:
+        edges = np.linspace(low, high if high > low else low + 1, bins + 1)
+    cells = ((values - edges[0]) * ((len(edges) - 1) / (edges[-1] - edges[0]))).astype(np.int64)
+    return edges, np.minimum(cells, len(edges) - 2)
+
+
+def points(x, y, max_points=MAX_POINTS, bins=DENSITY_BINS):
+    """
+    Scatter input ready to submit: (scatter, x, y) while there are at most
+    max_points points, else (density, counts, xedges, yedges) -- a 2D
+    histogram whose size does not depend on the row count.
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) <= max_points:
+        return scatter, x, y
+    xedges, xcell = _cells(x, bins)
+    yedges, ycell = _cells(y, bins)
+    shape = (len(xedges) - 1, len(yedges) - 1)
+    counts = np.bincount(xcell * shape[1] + ycell, minlength=shape[0] * shape[1]).reshape(shape)
+    return density, counts, xedges, yedges
+
+
+# -----------------------
+# Draw functions: draw(ax, data..., labels...)
+# -----------------------
+def _labels(ax, title, xlabel, ylabel, rotation=0, ha="center"):
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if rotation:
+        plt.setp(ax.get_xticklabels(), rotation=rotation, ha=ha)
+
+
+def line(ax, x, y, title="", xlabel="", ylabel="", marker=None, grid=False, rotation=0, ha="center"):
+    ax.plot(x, y, marker=marker)
+    if grid:
+        ax.grid(True)
+    _labels(ax, title, xlabel, ylabel, rotation, ha)
+
+
+def scatter(ax, x, y, title="", xlabel="", ylabel="", alpha=None, color=None):
+    ax.scatter(x, y, alpha=alpha, color=color)
+    _labels(ax, title, xlabel, ylabel)
+
+
+def density(ax, counts, xedges, yedges, title="", xlabel="", ylabel="", alpha=None, color=None):
+    """2D histogram from points(): log-scaled counts, empty cells blank, shaded in the scatter's color."""
+    cmap = "viridis" if color is None else LinearSegmentedColormap.from_list(
+        "density", [to_rgba(color, 0.15), to_rgba(color, 1.0)])
+    mesh = ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts.T, 0), cmap=cmap, norm=LogNorm())
+    ax.figure.colorbar(mesh, ax=ax, label="points")
+    _labels(ax, title, xlabel, ylabel)
+
+
+def bar(ax, labels, values, title="", xlabel="", ylabel="", yerr=None, color=None, palette=None,
+        rotation=0, ha="center"):
+    if palette is not None:
+        import seaborn as sns
+        color = sns.color_palette(palette, len(values))
+    ax.bar([str(label) for label in labels], values, yerr=yerr, capsize=4 if yerr is not None else 0,
+           color=color)
+    _labels(ax, title, xlabel, ylabel, rotation, ha)
+
+
+def hist(ax, values, bins=20, title="", xlabel="", ylabel="", grid=False):
+    ax.hist(values, bins=bins)
+    if grid:
+        ax.grid(True)
+    _labels(ax, title, xlabel, ylabel)
+
+
+def heatmap(ax, frame, title="", annot=True, fmt=".2g", cmap="coolwarm"):
+    """Annotated seaborn heatmap of a square DataFrame (e.g. a correlation matrix)."""
+    import seaborn as sns
+    sns.heatmap(frame, annot=annot, fmt=fmt, cmap=cmap, ax=ax)
+    ax.set_title(title)
+
+
+def matrix(ax, frame, title="", cmap="viridis"):
+    """Plain imshow of a square DataFrame with its column names on both axes and a colorbar."""
+    image = ax.imshow(frame, cmap=cmap, interpolation="nearest")
+    ax.figure.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(frame.columns)), frame.columns, rotation=45)
+    ax.set_yticks(range(len(frame.columns)), frame.columns)
+    ax.set_title(title)
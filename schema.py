@@ -0,0 +1,69 @@
+# ================================================
+# PER-TABLE COLUMN SCHEMA
+# Low-cardinality text columns are stored as pd.Categorical from the
+# moment they are loaded: integer codes plus one copy of each label,
+# instead of one Python string per row. Groupbys then run on the codes.
+#
+# A column maps to None when its categories are inferred from the data
+# (sorted lexically), or to a list when the set is fixed. Values outside
+# a declared set load as missing and the loader warns about them.
+# ================================================
+
+import pandas as pd
+
+CATEGORIES = {
+    "q1_data": {
+        "Region": None,
+        "Category": None,
+    },
+    "q2_data": {
+        "gender": None,
+        "Partner": None,
+        "Dependents": None,
+        "PhoneService": None,
+        "MultipleLines": None,
+        "InternetService": ["DSL", "Fiber optic", "No"],
+        "OnlineSecurity": None,
+        "OnlineBackup": None,
+        "DeviceProtection": None,
+        "TechSupport": None,
+        "StreamingTV": None,
+        "StreamingMovies": None,
+        "Contract": ["Month-to-month", "One year", "Two year"],
+        "PaperlessBilling": None,
+        "PaymentMethod": [
+            "Bank transfer (automatic)", "Credit card (automatic)",
+            "Electronic check", "Mailed check",
+        ],
+        "Churn": ["No", "Yes"],
+    },
+    "q4_data": {
+        "sex": None,
+        "cp": None,
+        "fbs": None,
+        "restecg": None,
+        "exang": None,
+        "slope": None,
+        "ca": None,
+        "thal": None,
+        "dataset": None,
+    },
+    "q5_data": {
+        "AREA_NAME": None,
+        "Crm_Cd_Desc": None,
+    },
+}
+
+
+def table_dtypes(table, columns=None, dtypes=None):
+    """
+    Load dtypes for `columns` of `table` (all declared columns when None):
+    the schema's categoricals, overridden by any explicit `dtypes`.
+    """
+    declared = CATEGORIES.get(table, {})
+    merged = {
+        col: pd.CategoricalDtype(cats) for col, cats in declared.items()
+        if columns is None or col in columns
+    }
+    merged.update(dtypes or {})
+    return merged or None
@@ -0,0 +1,127 @@
+# ================================================
+# BATCH CHURN SCORING
+# Loads the model saved by Q2.py once, streams q2_data from MySQL in
+# large chunks and writes each customer's churn probability back to
+# SCORE_OUTPUT with bulk executemany upserts. Rows without a customer
+# id cannot be keyed and are skipped.
+#
+# Reads go through an unbuffered cursor, so writes use a second pooled
+# connection. Config (env):
+#   SCORE_TABLE   source table          (default q2_data)
+#   SCORE_OUTPUT  destination table     (default q2_churn_scores)
+#   SCORE_KEY     customer id column    (default customerID)
+#   SCORE_BATCH   rows per chunk/insert (default 50000)
+#   Q2_MODEL_PATH model artifact        (default churn_model.joblib)
+# ================================================
+
+import os
+import time
+from datetime import datetime
+
+from db import get_connection
+from churn import DTYPES, FEATURES, MODEL_PATH, load
+from loader import iter_chunks, quote_ident
+
+SOURCE_TABLE = os.environ.get("SCORE_TABLE", "q2_data")
+OUTPUT_TABLE = os.environ.get("SCORE_OUTPUT", "q2_churn_scores")
+KEY = os.environ.get("SCORE_KEY", "customerID")
+BATCH = int(os.environ.get("SCORE_BATCH", "50000"))
+
+
+def create_output(conn):
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote_ident(OUTPUT_TABLE)} ("
+            f"{quote_ident(KEY)} VARCHAR(64) NOT NULL PRIMARY KEY, "
+            "churn_probability DOUBLE NOT NULL, "
+            "model_path VARCHAR(255) NOT NULL, "
+            "scored_at DATETIME NOT NULL)"
+        )
+    finally:
+        cur.close()
+
+
+def supports_row_alias(conn):
+    """INSERT ... AS new row aliases need MySQL 8.0.19+; MariaDB has none."""
+    version = conn.server_version or (0,)
+    return "mariadb" not in (conn.server_info or "").lower() and tuple(version) >= (8, 0, 19)
+
+
+def upsert_sql(row_alias=True):
+    # Row alias where the server has it: MySQL deprecates VALUES(col) from 8.0.20
+    key = quote_ident(KEY)
+    sql = (f"INSERT INTO {quote_ident(OUTPUT_TABLE)} "
+           f"({key}, churn_probability, model_path, scored_at) VALUES (%s, %s, %s, %s) ")
+    cols = ["churn_probability", "model_path", "scored_at"]
+    if row_alias:
+        return sql + "AS new ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = new.{c}" for c in cols)
+    return sql + "ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in cols)
+
+
+def main():
+    # -----------------------
+    # 1) Load the model once
+    # -----------------------
+    try:
+        model = load(MODEL_PATH)
+        print(f"✓ Loaded model {MODEL_PATH}")
+    except Exception as e:
+        print(f"✗ Could not load model '{MODEL_PATH}' (run Q2.py first): {e}")
+        exit(1)
+
+    # -----------------------
+    # 2) Separate read / write connections
+    # -----------------------
+    try:
+        read_conn = get_connection()
+        write_conn = get_connection()
+        create_output(write_conn)
+        print("✓ Database connected successfully")
+    except Exception as e:
+        print(f"✗ Database connection failed: {e}")
+        exit(1)
+
+    # -----------------------
+    # 3) Stream, score, write back
+    # -----------------------
+    sql = upsert_sql(supports_row_alias(write_conn))
+    scored_at = datetime.now().replace(microsecond=0)
+    total = skipped = 0
+    start = time.perf_counter()
+    try:
+        chunks = iter_chunks(read_conn, SOURCE_TABLE, [KEY] + FEATURES, DTYPES, chunksize=BATCH)
+        for chunk in chunks:
+            # A null id would be written as the string "nan" / "None"
+            missing = chunk[KEY].isna()
+            if missing.any():
+                skipped += int(missing.sum())
+                chunk = chunk[~missing]
+                if chunk.empty:
+                    continue
+            proba = model.predict_proba(chunk)[:, 1]
+            rows = list(zip(chunk[KEY].astype(str), proba.tolist(),
+                            [MODEL_PATH] * len(chunk), [scored_at] * len(chunk)))
+            cur = write_conn.cursor()
+            try:
+                cur.executemany(sql, rows)
+            finally:
+                cur.close()
+            write_conn.commit()
+            total += len(chunk)
+            print(f"  scored {total} rows ({total / (time.perf_counter() - start):,.0f} rows/s)")
+    except Exception as e:
+        print(f"✗ Scoring failed after {total} rows: {e}")
+        exit(1)
+    finally:
+        read_conn.close()
+        write_conn.close()
+
+    if skipped:
+        print(f"⚠ Skipped {skipped} rows with no {KEY}")
+    print(f"✓ Wrote {total} churn probabilities to '{OUTPUT_TABLE}' "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
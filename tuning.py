@@ -0,0 +1,182 @@
+# ================================================
+# Q2 CHURN HYPERPARAMETER SEARCH (SUCCESSIVE HALVING)
+# Candidates span the model backend, the categorical encoding and each
+# model's main knobs. Every round scores the surviving candidates with
+# k-fold CV on a row budget, keeps the best 1/TUNE_FACTOR and multiplies
+# the budget by TUNE_FACTOR, until one candidate is left or the budget
+# reaches the full training split (as HalvingRandomSearchCV does).
+#
+# Each (candidate, rows, fold) score is memoized on disk under
+# CACHE_DIR/tuning (unless DA_CACHE=0), keyed by the data fingerprint and
+# the parameters, so re-running a sweep after widening SPACE only fits
+# the new cells. Cells run in parallel on Q2_N_JOBS cores, one thread each.
+#
+# Config (env):
+#   TUNE_CANDIDATES  candidates in round 1 (default 27; 0 = whole SPACE)
+#   TUNE_FACTOR      halving factor (default 3)
+#   TUNE_CV          folds per cell (default 3)
+#   TUNE_MIN_ROWS    smallest row budget (default 500)
+#   TUNE_SAVE=1      save the refitted winner as the Q2 model artifact
+# ================================================
+
+import math
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+
+import cache
+import Q2
+from db import get_connection
+from churn import COLUMNS, DTYPES, N_JOBS, boosting, build_pipeline, forest, save, training_threads
+
+CANDIDATES = int(os.environ.get("TUNE_CANDIDATES", "27"))
+FACTOR = int(os.environ.get("TUNE_FACTOR", "3"))
+CV = int(os.environ.get("TUNE_CV", "3"))
+MIN_ROWS = int(os.environ.get("TUNE_MIN_ROWS", "500"))
+SAVE = os.environ.get("TUNE_SAVE", "0") == "1"
+
+# Per backend: a ParameterGrid over its pipeline options and model params
+SPACE = {
+    "rf": {
+        "encoding": ["ordinal", "onehot"],
+        "n_estimators": [100, 250, 500],
+        "max_depth": [None, 8, 16],
+        "min_samples_leaf": [1, 5, 20],
+        "max_features": ["sqrt", 0.5],
+    },
+    "hgb": {
+        "learning_rate": [0.03, 0.1, 0.3],
+        "max_leaf_nodes": [15, 31, 63],
+        "l2_regularization": [0.0, 1.0],
+    },
+}
+
+memory = Memory(os.path.join(cache.CACHE_DIR, "tuning") if cache.ENABLED else None, verbose=0)
+
+
+def candidates(space=SPACE, limit=CANDIDATES):
+    """
+    Every parameter combination in `space`, or `limit` of them. The sample
+    is the `limit` lowest parameter hashes, so adding a value to SPACE
+    keeps most earlier candidates (and their cached scores) in the sweep.
+    """
+    grid = [{"model": backend, **params}
+            for backend, options in space.items() for params in ParameterGrid(options)]
+    grid.sort(key=joblib.hash)
+    return grid[:limit] if limit else grid
+
+
+def make_pipeline(candidate, n_jobs=N_JOBS):
+    params = dict(candidate)
+    backend = params.pop("model")
+    encoding = params.pop("encoding", "ordinal")
+    model = forest(n_jobs=n_jobs, **params) if backend == "rf" else boosting(**params)
+    return build_pipeline(model, encoding)
+
+
+def label(candidate):
+    return " ".join(f"{k}={v}" for k, v in candidate.items())
+
+
+@memory.cache(ignore=["X", "y"])
+def score_cell(X, y, data_key, candidate, rows, fold, folds):
+    """Accuracy of `candidate` on one CV fold of the first `rows` rows; cached on disk."""
+    X, y = X.iloc[:rows], y.iloc[:rows]
+    train, test = list(StratifiedKFold(folds, shuffle=True, random_state=42).split(X, y))[fold]
+    # One core per cell: the cells themselves already fill the cores
+    model = make_pipeline(candidate, n_jobs=1)
+    with training_threads(1):
+        model.fit(X.iloc[train], y.iloc[train])
+    return accuracy_score(y.iloc[test], model.predict(X.iloc[test]))
+
+
+def successive_halving(X, y, pool, factor=FACTOR, folds=CV, min_rows=MIN_ROWS):
+    """Run the halving rounds over `pool`; returns (winner, per-round scores)."""
+    # Row budgets are prefixes of one fixed shuffle, so a cell's rows never change
+    order = np.random.default_rng(42).permutation(len(X))
+    X, y = X.iloc[order].reset_index(drop=True), y.iloc[order].reset_index(drop=True)
+    data_key = joblib.hash((X, y))
+
+    rounds = max(1, math.ceil(math.log(len(pool), factor)))
+    rows = max(min_rows, len(X) // factor ** rounds)
+    history = []
+    for step in range(rounds + 1):
+        rows = min(rows, len(X))
+        cells = [(c, fold) for c in pool for fold in range(folds)]
+        cached = sum(score_cell.check_call_in_cache(X, y, data_key, c, rows, fold, folds)
+                     for c, fold in cells)
+        start = time.perf_counter()
+        scores = Parallel(n_jobs=N_JOBS)(
+            delayed(score_cell)(X, y, data_key, c, rows, fold, folds) for c, fold in cells
+        )
+        print(f"  round {step + 1}: {len(pool)} candidates x {folds} folds on {rows} rows "
+              f"({len(cells) - cached} fitted, {cached} cached, {time.perf_counter() - start:.1f}s)")
+
+        table = pd.DataFrame({
+            "round": step + 1,
+            "rows": rows,
+            "candidate": [label(c) for c in pool],
+            "accuracy": np.reshape(scores, (len(pool), folds)).mean(axis=1),
+        })
+        history.append(table)
+
+        ranked = table["accuracy"].to_numpy().argsort(kind="stable")[::-1]
+        pool = [pool[i] for i in ranked[:max(1, math.ceil(len(pool) / factor))]]
+        if len(pool) == 1 or rows == len(X):
+            break
+        rows *= factor
+    return pool[0], pd.concat(history, ignore_index=True)
+
+
+def main():
+    # -----------------------
+    # 1) Load, clean + split with Q2.py's own steps
+    # -----------------------
+    try:
+        conn = get_connection()
+        df = cache.cached_load(conn, "q2_data", COLUMNS, DTYPES)
+        conn.close()
+    except Exception as e:
+        print(f"✗ Data loading failed: {e}")
+        exit(1)
+    X_train, X_test, y_train, y_test = Q2.split(Q2.clean(df))
+
+    # -----------------------
+    # 2) Successive halving on the training split
+    # -----------------------
+    pool = candidates()
+    print(f"✓ Tuning {len(pool)} candidates on {len(X_train)} training rows "
+          f"(factor {FACTOR}, {CV}-fold CV, n_jobs={N_JOBS})")
+    best, history = successive_halving(X_train, y_train, pool)
+
+    last = history[history["round"] == history["round"].max()]
+    print("\nFinal round:")
+    print(last.sort_values("accuracy", ascending=False).to_string(index=False))
+
+    # -----------------------
+    # 3) Refit the winner on the full training split, score the test split
+    #    (a single fit, so it gets all Q2_N_JOBS threads)
+    # -----------------------
+    model = make_pipeline(best)
+    with training_threads():
+        model.fit(X_train, y_train)
+    pred = model.predict(X_test)
+    accuracy = accuracy_score(y_test, pred)
+    print(f"\n✓ Best: {label(best)}")
+    print("Test Accuracy:", accuracy)
+    print("\nClassification Report:\n", classification_report(y_test, pred))
+
+    if SAVE:
+        path = save(model, backend=best["model"], params=best, rows=len(X_train),
+                    accuracy=round(accuracy, 4))
+        print(f"✓ Tuned model saved -> {path}")
+
+
+if __name__ == "__main__":
+    main()